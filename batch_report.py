@@ -0,0 +1,194 @@
+"""
+Relatórios em lote, sem o Streamlit: para cada planilha de um diretório gera
+os mesmos arquivos dos botões de download do dashboard, no período completo
+e com todos os poços:
+
+    <saida>/<planilha>/graficos.html   relatório com os gráficos das três views
+    <saida>/<planilha>/graficos.zip    um PNG por gráfico (Kaleido)
+    <saida>/<planilha>/dados.xlsx      abas tratadas, uma por conjunto
+
+As planilhas são distribuídas em um pool de processos. Em cada processo a
+leitura, os gráficos e o xlsx rodam com o espaço de endereçamento limitado a
+--max-memory MB (uma planilha que não cabe falha sozinha com MemoryError), e o
+processo é trocado a cada --tasks-per-child planilhas para devolver a memória.
+No fim, mostra a vazão em planilhas por minuto.
+
+Uso:
+    python batch_report.py planilhas/ [--output relatorios] [--workers 4]
+        [--formats html png xlsx] [--granularity Mensal] [--max-memory 2048]
+"""
+import argparse
+import contextlib
+import glob
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import resource
+except ImportError:  # Windows: sem limite de memória por processo
+    resource = None
+
+from components.btn.data_export import write_xlsx
+from components.btn.png_export import PngRenderer
+from components.btn.report import build_html_report
+from components.charts import FL_TIPOS, fig_acumulado, fig_fl, fig_volume_barras, fl_chart_frame, volume_chart_frame
+from utils import CumulativeVolume, DailyRollup, granularity_to_freq, parse_workbook
+
+FORMATS = ("html", "png", "xlsx")
+GRANULARIDADES = ["Diário", "Semanal", "Mensal", "Anual"]
+
+# Colunas somadas em cada view de volume (como no dashboard)
+VOLUMES = {
+    "Volume Produto": ['Volume Removido SAO (L)', 'Volume Removido Bailer (L)'],
+    "Volume Bombeado": ['Volume Bombeado (L)'],
+}
+
+# Renderizador de PNG do processo (criado no primeiro uso)
+_renderer = None
+
+
+@contextlib.contextmanager
+def memory_limit(max_mb):
+    """Limita o espaço de endereçamento do processo dentro do bloco (None/0 = sem limite)."""
+    if not max_mb or resource is None:
+        yield
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = int(max_mb * 2**20)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def build_figures(frames, freq):
+    """Gráficos das views FL, Volume Produto e Volume Bombeado no período completo de cada aba."""
+    figs = []
+    fl = frames.get("FL")
+    if fl is not None and len(fl):
+        rollup = DailyRollup(fl, FL_TIPOS, 'Data', 'Poço')
+        grafico = fl_chart_frame(rollup, fl['Data'].min(), fl['Data'].max(), freq)
+        figs += [fig_fl(grafico, tipo) for tipo in FL_TIPOS]
+    for sheet, colunas in VOLUMES.items():
+        df = frames.get(sheet)
+        if df is None or not len(df):
+            continue
+        rollup = DailyRollup(df, colunas, 'Data')
+        acumulado = CumulativeVolume(df, colunas, 'Data')
+        grafico = volume_chart_frame(rollup, acumulado, df['Data'].min(), df['Data'].max(), freq)
+        figs.append(fig_acumulado(grafico))
+        figs += [fig_volume_barras(grafico, col) for col in colunas]
+    return figs
+
+
+def _write(path, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def process_workbook(path, output, formats=FORMATS, freq="MS", max_mb=None, png_timeout=30.0):
+    """
+    Gera os arquivos de uma planilha. Devolve só um resumo (nome, linhas,
+    arquivos, tempo e erro), para o processo principal não receber DataFrames.
+    """
+    global _renderer
+    t0 = time.perf_counter()
+    name = os.path.splitext(os.path.basename(path))[0]
+    target = os.path.join(output, name)
+    result = {"workbook": name, "rows": 0, "artifacts": [], "seconds": 0.0, "error": None}
+    try:
+        os.makedirs(target, exist_ok=True)
+        with memory_limit(max_mb):
+            with open(path, "rb") as f:
+                frames = parse_workbook(f.read())
+            result["rows"] = sum(len(df) for df in frames.values())
+            figs = build_figures(frames, freq)
+            if "html" in formats:
+                _write(os.path.join(target, "graficos.html"), build_html_report(figs, title=name))
+                result["artifacts"].append("graficos.html")
+            if "xlsx" in formats:
+                write_xlsx(frames, os.path.join(target, "dados.xlsx"))
+                result["artifacts"].append("dados.xlsx")
+        # Fora do limite: o Kaleido roda em um processo próprio (com timeout), que herdaria o limite
+        if "png" in formats and figs:
+            if _renderer is None:
+                _renderer = PngRenderer(workers=1, timeout=png_timeout)
+            pngs = _renderer.render(figs)
+            if not any(pngs):
+                raise RuntimeError("nenhum PNG gerado (Kaleido/Chrome indisponível?)")
+            with zipfile.ZipFile(os.path.join(target, "graficos.zip"), "w", zipfile.ZIP_DEFLATED) as zf:
+                for i, png in enumerate(pngs, start=1):
+                    if png:
+                        zf.writestr(f"{name}_{i}.png", png)
+            result["artifacts"].append("graficos.zip")
+    except MemoryError:
+        result["error"] = f"memória excedida (limite de {max_mb} MB)"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - t0
+    return result
+
+
+def run(paths, output, workers=None, formats=FORMATS, freq="MS", max_mb=None, tasks_per_child=20, png_timeout=30.0):
+    """Processa as planilhas (workers=0: no próprio processo) e gera um resumo por planilha, na ordem em que terminam."""
+    if workers == 0:
+        for path in paths:
+            yield process_workbook(path, output, formats, freq, max_mb, png_timeout)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers or min(4, os.cpu_count() or 1),
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=tasks_per_child,
+    ) as pool:
+        futures = {pool.submit(process_workbook, path, output, formats, freq, max_mb, png_timeout): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except BrokenProcessPool as e:
+                # Processo encerrado pelo sistema (ex.: falta de memória fora do limite)
+                name = os.path.splitext(os.path.basename(futures[future]))[0]
+                yield {"workbook": name, "rows": 0, "artifacts": [], "seconds": 0.0, "error": f"processo encerrado: {e}"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="diretório com as planilhas .xlsx")
+    parser.add_argument("--output", default="relatorios")
+    parser.add_argument("--workers", type=int, help="processos (padrão: até 4; 0 = sem pool)")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--granularity", choices=GRANULARIDADES, default="Mensal")
+    parser.add_argument("--max-memory", type=float, default=2048, help="MB de espaço de endereçamento por processo, bibliotecas incluídas (0 = sem limite)")
+    parser.add_argument("--tasks-per-child", type=int, default=20, help="planilhas por processo antes de trocá-lo")
+    parser.add_argument("--png-timeout", type=float, default=30, help="segundos por gráfico no Kaleido")
+    args = parser.parse_args()
+
+    paths = sorted(p for p in glob.glob(os.path.join(args.input, "*.xlsx")) if not os.path.basename(p).startswith("~$"))
+    if not paths:
+        print(f"Nenhuma planilha .xlsx em {args.input}")
+        return 1
+
+    t0 = time.perf_counter()
+    falhas = 0
+    for r in run(paths, args.output, args.workers, args.formats, granularity_to_freq(args.granularity), args.max_memory, args.tasks_per_child, args.png_timeout):
+        if r["error"]:
+            falhas += 1
+            print(f"ERRO {r['workbook']}: {r['error']}")
+        else:
+            print(f"ok   {r['workbook']}: {r['rows']} linhas, {', '.join(r['artifacts'])} ({r['seconds']:.1f}s)")
+    elapsed = time.perf_counter() - t0
+    feitas = len(paths) - falhas
+    print(f"{feitas}/{len(paths)} planilhas em {elapsed:.1f}s: {feitas / (elapsed / 60):.1f} planilhas/min")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Compara a leitura antiga (quatro chamadas a pd.read_excel) com utils.read_sheets.
+
+Uso:
+    python benchmarks/bench_excel_reader.py [--rows 2000 10000] [--repeat 3]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.workbook_generator import make_workbook  # noqa: E402
+from utils import SHEETS, available_engine, read_sheets, tratando_df  # noqa: E402
+
+
+def workbook_for_rows(rows: int, n_wells: int = 10) -> bytes:
+    """Planilha sintética com cerca de `rows` linhas no FL e no Volume Bombeado."""
+    return make_workbook(wells=n_wells, years=rows / (n_wells * 365 * 0.9))
+
+
+def legacy_read(data: bytes):
+    """Caminho antigo do dashboard: uma abertura da planilha por aba."""
+    return {
+        sheet: tratando_df(pd.read_excel(io.BytesIO(data), sheet_name=sheet, engine="openpyxl"))
+        for sheet in SHEETS
+    }
+
+
+def single_pass_read(data: bytes, engine=None):
+    frames = read_sheets(io.BytesIO(data), SHEETS, engine=engine)
+    return {sheet: tratando_df(df) for sheet, df in frames.items()}
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[2000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engines = ["openpyxl"]
+    if available_engine() != "openpyxl":
+        engines.append(available_engine())
+
+    print(f"{'linhas':>8} {'leitura antiga':>15} " + " ".join(f"{e:>12}" for e in engines))
+    for rows in args.rows:
+        data = workbook_for_rows(rows)
+        legacy = best_of(lambda: legacy_read(data), args.repeat)
+        new = [best_of(lambda: single_pass_read(data, e), args.repeat) for e in engines]
+        print(f"{rows:>8} {legacy:>14.3f}s " + " ".join(f"{t:>11.3f}s" for t in new))
+
+
+if __name__ == "__main__":
+    main()
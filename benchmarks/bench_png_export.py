@@ -0,0 +1,66 @@
+"""
+Tempo de exportação de PNG em função do número de gráficos: renderização
+sequencial com fig.write_image (caminho antigo) versus PngRenderer em paralelo.
+
+Uso:
+    python benchmarks/bench_png_export.py [--figs 1 2 4 8] [--workers 4] [--points 2000]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.workbook_generator import make_frames  # noqa: E402
+from components.btn.png_export import PngRenderer  # noqa: E402
+from components.charts import fig_volume_barras  # noqa: E402
+
+
+def make_figs(n: int, points: int):
+    """n gráficos de barras do Volume Bombeado com `points` dias (planilha sintética)."""
+    df = make_frames(wells=1, years=points / 365, presence=1, blank_fraction=0)["Volume Bombeado"]
+    return [fig_volume_barras(df, "Volume Bombeado (L)") for _ in range(n)]
+
+
+def sequential(figs):
+    for fig in figs:
+        fig.write_image(io.BytesIO(), format="png")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--figs", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--points", type=int, default=2000)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        print("Kaleido não instalado; nada a medir.")
+        return
+
+    renderer = PngRenderer(workers=args.workers, timeout=args.timeout)
+    # Aquece o pool antes de medir (custo pago uma vez por processo do servidor)
+    t0 = time.perf_counter()
+    renderer.render(make_figs(args.workers, 10))
+    print(f"aquecimento do pool ({args.workers} processos): {time.perf_counter() - t0:.2f}s")
+
+    print(f"{'gráficos':>9} {'sequencial':>11} {'paralelo':>9} {'ok':>4}")
+    for n in args.figs:
+        figs = make_figs(n, args.points)
+        t0 = time.perf_counter()
+        sequential(figs)
+        seq = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        out = renderer.render(figs)
+        par = time.perf_counter() - t0
+        print(f"{n:>9} {seq:>10.2f}s {par:>8.2f}s {sum(1 for png in out if png):>4}")
+    renderer.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark de ponta a ponta sobre planilhas sintéticas (workbook_generator):
+tempo e pico de memória de cada etapa do dashboard em vários tamanhos.
+
+Etapas: tratando_df, ordenação e filtros de data, aggregate_by_period,
+acumulados (add_accumulated_column, add_cumulative, CumulativeVolume),
+DailyRollup, montagem das figuras e os exportadores (dados e relatório HTML).
+
+O tempo é o melhor de --repeat execuções; o pico de memória vem do
+tracemalloc em uma execução separada (alocações do numpy/pandas entram,
+buffers internos do pyarrow não).
+
+Uso:
+    python benchmarks/bench_suite.py [--sizes 10x1 20x5 50x10] [--repeat 3] [--only filter exportar]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.workbook_generator import make_frames  # noqa: E402
+from components.btn import build_html_report, export_datasets  # noqa: E402
+from components.charts import FL_TIPOS, fig_fl, fig_volume_acumulado, fig_volume_barras  # noqa: E402
+from utils import (  # noqa: E402
+    CumulativeVolume,
+    DailyRollup,
+    add_accumulated_column,
+    add_cumulative,
+    aggregate_by_period,
+    filter_by_date,
+    sort_by_date,
+    tratando_df,
+)
+
+
+def parse_size(text: str):
+    wells, _, years = text.lower().partition("x")
+    return int(wells), float(years)
+
+
+def prepare(wells: int, years: float):
+    """Dados brutos (como lidos da planilha) e já tratados/ordenados."""
+    raw = make_frames(wells, years)
+    frames = {name: sort_by_date(tratando_df(df.copy()), "Data") for name, df in raw.items()}
+    dates = frames["Volume Bombeado"]["Data"]
+    # Janela do meio: metade do período carregado
+    span = dates.iloc[-1] - dates.iloc[0]
+    window = (dates.iloc[0] + span / 4, dates.iloc[0] + span * 3 / 4)
+    return raw, frames, window
+
+
+def stages(raw, frames, window):
+    """Etapa -> função sem argumentos. Entradas montadas aqui não entram na medição."""
+    start, end = window
+    bombeado = frames["Volume Bombeado"]
+    produto = frames["Volume Produto"]
+    fl = frames["FL"]
+    produto_cols = ["Volume Removido SAO (L)", "Volume Removido Bailer (L)"]
+    shuffled = bombeado.sample(frac=1, random_state=0)
+    cumulative = CumulativeVolume(bombeado, ["Volume Bombeado (L)"])
+    fl_mensal = aggregate_by_period(filter_by_date(fl, "Data", start, end), "Data", "MS", {t: "mean" for t in FL_TIPOS}, ["Poço"])
+    produto_mensal = aggregate_by_period(produto, "Data", "MS", {c: "sum" for c in produto_cols})
+    produto_mensal = add_accumulated_column(produto_mensal, produto_cols, "Volume Acumulado (L)")
+    figs = [fig_fl(fl_mensal, t) for t in FL_TIPOS]
+    export = {name: filter_by_date(df, "Data", start, end) for name, df in frames.items()}
+
+    return {
+        "tratando_df": lambda: [tratando_df(df) for df in raw.values()],
+        "sort_by_date (desordenado)": lambda: sort_by_date(shuffled, "Data"),
+        "filter_by_date": lambda: [filter_by_date(df, "Data", start, end) for df in frames.values()],
+        "aggregate_by_period FL (MS)": lambda: aggregate_by_period(fl, "Data", "MS", {t: "mean" for t in FL_TIPOS}, ["Poço"]),
+        "aggregate_by_period bombeado (D)": lambda: aggregate_by_period(bombeado, "Data", "D", {"Volume Bombeado (L)": "sum"}),
+        "add_accumulated_column": lambda: add_accumulated_column(shuffled, ["Volume Bombeado (L)"], "Volume Acumulado (L)"),
+        "add_cumulative": lambda: add_cumulative(bombeado, "Data", ["Volume Bombeado (L)"], "Volume Acumulado (L)"),
+        "CumulativeVolume (construção)": lambda: CumulativeVolume(bombeado, ["Volume Bombeado (L)"]),
+        "CumulativeVolume.window": lambda: cumulative.window(start, end),
+        "DailyRollup FL (construção)": lambda: DailyRollup(fl, FL_TIPOS, "Data", "Poço"),
+        "figuras FL (MS)": lambda: [fig_fl(fl_mensal, t) for t in FL_TIPOS],
+        "figuras volume (MS)": lambda: [fig_volume_acumulado(produto_mensal), *(fig_volume_barras(produto_mensal, c) for c in produto_cols)],
+        "exportar excel": lambda: export_datasets(export, "excel"),
+        "exportar csv": lambda: export_datasets(export, "csv"),
+        "exportar parquet": lambda: export_datasets(export, "parquet"),
+        "relatório HTML": lambda: build_html_report(figs),
+    }
+
+
+def best_time(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def peak_memory(fn) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["10x1", "20x5", "50x10"], help="POÇOSxANOS")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="roda só as etapas cujo nome contém um destes textos")
+    args = parser.parse_args()
+
+    print(f"{'tamanho':>10} {'linhas':>9}  {'etapa':<34} {'tempo':>9} {'pico':>10}")
+    for size in args.sizes:
+        wells, years = parse_size(size)
+        raw, frames, window = prepare(wells, years)
+        rows = len(frames["Volume Bombeado"])
+        for name, fn in stages(raw, frames, window).items():
+            if args.only and not any(text.lower() in name.lower() for text in args.only):
+                continue
+            seconds = best_time(fn, args.repeat)
+            peak = peak_memory(fn)
+            print(f"{size:>10} {rows:>9}  {name:<34} {seconds:>8.3f}s {peak / 2**20:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Tempo de importação (cold start) de app.py e de cada página, medido com
+`python -X importtime` em um processo novo por alvo.
+
+Só os imports do topo de cada arquivo são executados (o resto do script do
+Streamlit não roda). Falha (código de saída 1) quando algum alvo passa do
+orçamento, para ser usado no build do container.
+
+Uso:
+    python benchmarks/import_budget.py [--budget 1.5] [--limit pages/login.py=0.8] [--runs 3] [--top 10]
+"""
+import argparse
+import ast
+import glob
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Orçamento padrão por alvo, em segundos (sobrescrito por --budget / --limit)
+DEFAULT_BUDGET = 2.0
+
+
+def default_targets():
+    return ["app.py"] + sorted(os.path.relpath(p, ROOT) for p in glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def top_level_imports(path: str) -> str:
+    """Código com apenas os imports do topo do arquivo (na ordem em que aparecem)."""
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return ast.unparse(ast.Module(body=nodes, type_ignores=[]))
+
+
+def parse_importtime(stderr: str):
+    """
+    Linhas do -X importtime -> (total em segundos, [(cumulativo em s, módulo)])
+    dos módulos importados diretamente pelo alvo (nível mais externo).
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # cabeçalho
+        name = fields[2]
+        # Módulos de primeiro nível têm um único espaço antes do nome
+        if name.startswith(" ") and not name.startswith("  "):
+            modules.append((int(fields[1]) / 1e6, name.strip()))
+    return sum(t for t, _ in modules), modules
+
+
+def measure(path: str):
+    """Importa os módulos do alvo em um interpretador novo e devolve (total, módulos)."""
+    code = top_level_imports(path)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": ROOT},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{path}: falha ao importar\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def parse_limits(items):
+    limits = {}
+    for item in items or []:
+        target, _, seconds = item.partition("=")
+        limits[target] = float(seconds)
+    return limits
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="*", help="arquivos relativos à raiz (padrão: app.py e pages/*.py)")
+    parser.add_argument("--budget", type=float, default=float(os.environ.get("IMPORT_BUDGET", DEFAULT_BUDGET)),
+                        help="orçamento padrão por alvo, em segundos (env IMPORT_BUDGET)")
+    parser.add_argument("--limit", action="append", metavar="ALVO=SEGUNDOS", help="orçamento de um alvo específico")
+    parser.add_argument("--runs", type=int, default=3, help="medições por alvo; vale a menor")
+    parser.add_argument("--top", type=int, default=8, help="módulos mais lentos listados por alvo")
+    args = parser.parse_args(argv)
+
+    limits = parse_limits(args.limit)
+    failed = []
+    for target in args.targets or default_targets():
+        best = None
+        for _ in range(max(1, args.runs)):
+            total, modules = measure(target)
+            if best is None or total < best[0]:
+                best = (total, modules)
+        total, modules = best
+        budget = limits.get(target, args.budget)
+        status = "ok" if total <= budget else "ESTOUROU"
+        print(f"{target:<24} {total:>6.3f}s  (orçamento {budget:.2f}s)  {status}")
+        for seconds, name in sorted(modules, reverse=True)[:args.top]:
+            print(f"    {seconds:>6.3f}s  {name}")
+        if total > budget:
+            failed.append(target)
+
+    if failed:
+        print(f"\nAcima do orçamento: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
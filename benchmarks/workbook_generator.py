@@ -0,0 +1,135 @@
+"""
+Gera planilhas sintéticas com o mesmo layout que o dashboard espera:
+abas "Volume Bombeado", "Volume Produto", "FL" e "Hidrômetros", com colunas
+"Unnamed" (células de anotação sem cabeçalho) e linhas com "Data" em branco.
+
+Uso:
+    python benchmarks/workbook_generator.py saida.xlsx [--wells 20] [--years 5] [--seed 0]
+"""
+import argparse
+import io
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+START = "2018-01-01"
+
+
+def _with_blank_rows(df: pd.DataFrame, rng: np.random.Generator, fraction: float) -> pd.DataFrame:
+    """Insere linhas sem data (comuns em planilhas preenchidas à mão) e algumas no final."""
+    n_blank = int(len(df) * fraction)
+    if n_blank == 0:
+        return df
+    positions = np.sort(rng.integers(0, len(df) + 1, n_blank))
+    # -1 marca as linhas em branco; três delas ficam no final, como sobra de formatação
+    rows = np.append(np.insert(np.arange(len(df)), positions, -1), [-1] * min(3, n_blank))
+    out = df.iloc[np.maximum(rows, 0)].reset_index(drop=True)
+    out.loc[rows < 0, :] = None
+    return out
+
+
+def _notes(rng: np.random.Generator, n: int, fraction: float = 0.02) -> np.ndarray:
+    """Coluna sem cabeçalho com anotações esparsas."""
+    notes = np.full(n, None, dtype=object)
+    notes[rng.random(n) < fraction] = "verificar"
+    return notes
+
+
+def make_frames(
+    wells: int = 10,
+    years: float = 1,
+    seed: int = 0,
+    start: str = START,
+    presence: float = 0.9,
+    blank_fraction: float = 0.01,
+) -> Dict[str, pd.DataFrame]:
+    """
+    DataFrames das quatro abas, como seriam lidos de uma planilha real.
+
+    - wells: número de poços (PM-01, PM-02, ...)
+    - years: anos de registros diários a partir de start
+    - presence: fração dos dias em que cada poço tem registro
+    - blank_fraction: fração de linhas com "Data" em branco em cada aba
+    """
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(start, periods=max(int(round(years * 365)), 1), freq="D")
+    nomes = [f"PM-{i + 1:02d}" for i in range(wells)]
+
+    data = np.repeat(days.to_numpy(), wells)
+    pocos = np.tile(np.array(nomes, dtype=object), len(days))
+    keep = rng.random(len(data)) < presence
+    data, pocos = data[keep], pocos[keep]
+    n = len(data)
+
+    # Bombeamento com dias parados (volume zero) e algumas células vazias
+    bombeado = rng.gamma(2.0, 40.0, n) * (rng.random(n) > 0.1)
+    bombeado[rng.random(n) < 0.01] = np.nan
+
+    # FL: nível de óleo acima do nível de água; espessura = NA - NO
+    base = rng.uniform(2, 12, wells)[pd.Index(nomes).get_indexer(pocos)]
+    na = base + rng.normal(0, 0.3, n)
+    esp = np.clip(rng.gamma(1.2, 0.08, n), 0, None)
+    no = na - esp
+    sem_oleo = rng.random(n) < 0.2
+    no[sem_oleo] = np.nan
+    esp[sem_oleo] = np.nan
+
+    sao = np.round(rng.gamma(1.5, 0.6, len(days)) * (rng.random(len(days)) > 0.3), 3)
+    bailer = np.round(rng.gamma(1.2, 0.4, len(days)) * (rng.random(len(days)) > 0.5), 3)
+    hidrometros = {
+        f"HD-{i + 1:02d}": np.round(np.cumsum(rng.gamma(2.0, 5.0, len(days))), 1)
+        for i in range(max(1, wells // 5))
+    }
+
+    frames = {
+        "Volume Bombeado": pd.DataFrame({
+            "Data": data, "Poço": pocos,
+            "Volume Bombeado (L)": np.round(bombeado, 2),
+            "Unnamed: 3": _notes(rng, n),
+        }),
+        "Volume Produto": pd.DataFrame({
+            "Data": days,
+            "Volume Removido SAO (L)": sao,
+            "Volume Removido Bailer (L)": bailer,
+            "Unnamed: 3": _notes(rng, len(days)),
+        }),
+        "FL": pd.DataFrame({
+            "Data": data, "Poço": pocos,
+            "NA (m)": np.round(na, 3), "NO (m)": np.round(no, 3), "Esp. (m)": np.round(esp, 3),
+            "Unnamed: 5": _notes(rng, n), "Unnamed: 6": None,
+        }),
+        "Hidrômetros": pd.DataFrame({"Data": days, **hidrometros, f"Unnamed: {len(hidrometros) + 1}": None}),
+    }
+    return {name: _with_blank_rows(df, rng, blank_fraction) for name, df in frames.items()}
+
+
+def write_workbook(frames: Dict[str, pd.DataFrame], target) -> None:
+    """Grava as abas em um arquivo .xlsx (caminho ou buffer)."""
+    with pd.ExcelWriter(target, engine="xlsxwriter", datetime_format="dd/mm/yyyy") as writer:
+        for name, df in frames.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+
+
+def make_workbook(wells: int = 10, years: float = 1, seed: int = 0, **kwargs) -> bytes:
+    """Planilha sintética completa em bytes (como chega do file_uploader)."""
+    buffer = io.BytesIO()
+    write_workbook(make_frames(wells, years, seed, **kwargs), buffer)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output")
+    parser.add_argument("--wells", type=int, default=10)
+    parser.add_argument("--years", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", default=START)
+    args = parser.parse_args()
+    frames = make_frames(args.wells, args.years, args.seed, start=args.start)
+    write_workbook(frames, args.output)
+    print(", ".join(f"{name}: {len(df)} linhas" for name, df in frames.items()))
+
+
+if __name__ == "__main__":
+    main()
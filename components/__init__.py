@@ -1,3 +1,29 @@
-from .btn import btn_download_multiple, btn_download_excel
+"""
+Componentes da interface. Os nomes abaixo são importados só no primeiro
+acesso (PEP 562), para que components.charts e os exportadores possam ser
+usados fora do Streamlit (ex.: batch_report.py) sem importá-lo.
+"""
+import importlib
 
-__all__ = ["btn_download_multiple", "btn_download_excel"]
+# Nome exportado -> submódulo que o define
+_EXPORTS = {
+    "btn_download_multiple": "btn",
+    "btn_download_excel": "btn",
+    "btn_download_datasets": "btn",
+    "paginated_table": "table",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
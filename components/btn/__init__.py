@@ -1,6 +1,32 @@
-from .btn_download import btn_download_multiple, btn_download_excel
+"""
+Botões de download e exportadores. Os nomes são importados só no primeiro
+acesso (PEP 562): report, data_export e png_export não dependem do Streamlit.
+"""
+import importlib
 
-__all__ = [
-    "btn_download_multiple",
-    "btn_download_excel"
-]
\ No newline at end of file
+# Nome exportado -> submódulo que o define
+_EXPORTS = {
+    "btn_download_multiple": "btn_download",
+    "btn_download_excel": "btn_download",
+    "btn_download_datasets": "btn_download",
+    "build_html_report": "report",
+    "PngRenderer": "png_export",
+    "get_renderer": "png_export",
+    "export_datasets": "data_export",
+    "open_export": "data_export",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
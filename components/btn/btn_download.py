@@ -1,81 +1,150 @@
 import streamlit as st
-import io
-import zipfile
-import pandas as pd
-import plotly.graph_objects as go
+import hashlib
+import importlib.util
+import threading
+from collections import OrderedDict
+
+from utils.profiling import bound, stage, timed
+
+from .data_export import FORMATS as EXPORT_FORMATS, open_export
+from .png_export import get_renderer
+from .report import build_html_report
 
 DICT_TYPE = {
     "html": "text/html",
     "excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     "png": "application/zip",
+    "gzip": "application/gzip",
 }
 
-def convert_fig_to_html(fig) -> str:
-    """Converte um gráfico Plotly em string HTML."""
-    return fig.to_html(full_html=False)
-
-def fig_to_png_bytes(fig):
-    """Tenta converter um gráfico Plotly em bytes PNG. Retorna None se Kaleido não estiver disponível."""
-    try:
-        buf = io.BytesIO()
-        fig.write_image(buf, format="png")
-        buf.seek(0)
-        return buf
-    except Exception as e:
-        print(f"PNG não disponível: {e}")
-        return None
+# Arquivos já gerados, indexados pelo hash do conteúdo (gráficos ou DataFrame).
+# Limitados pelo total de bytes; um arquivo maior que o limite não é guardado.
+MAX_ARTIFACT_BYTES = 64 * 1024 * 1024
+_artifacts: "OrderedDict[tuple, bytes]" = OrderedDict()
+_artifacts_nbytes = 0
+_artifacts_lock = threading.Lock()
+
+
+def _cached_artifact(key: tuple, build):
+    """Retorna o arquivo gerado para a chave, gerando-o apenas na primeira vez."""
+    global _artifacts_nbytes
+    with _artifacts_lock:
+        if key in _artifacts:
+            _artifacts.move_to_end(key)
+            return _artifacts[key]
+    # As funções de download rodam em threads separadas do script
+    with stage(f"gerar {key[0]}"):
+        data = build()
+    with _artifacts_lock:
+        if len(data) <= MAX_ARTIFACT_BYTES and key not in _artifacts:
+            _artifacts[key] = data
+            _artifacts_nbytes += len(data)
+            while _artifacts_nbytes > MAX_ARTIFACT_BYTES:
+                _, old = _artifacts.popitem(last=False)
+                _artifacts_nbytes -= len(old)
+    return data
+
+
+def figs_hash(figs) -> str:
+    """
+    Hash da especificação (JSON) dos gráficos. Gráficos vindos do FigureCache
+    (utils.figure_cache) já trazem o spec serializado e o hash da chave.
+    """
+    h = hashlib.sha256()
+    for fig in figs:
+        key_hash = getattr(fig, "key_hash", None)
+        h.update((key_hash or fig.to_json()).encode())
+    return h.hexdigest()
+
+
+def png_available() -> bool:
+    """Indica se o Kaleido (exportação de imagens do Plotly) está instalado."""
+    return importlib.util.find_spec("kaleido") is not None
+
+
+def figs_to_html(figs, compress: bool = False) -> bytes:
+    """Relatório HTML com todos os gráficos (gerado apenas no clique, com cache)."""
+    return _cached_artifact(("html", compress, figs_hash(figs)), lambda: build_html_report(figs, compress=compress))
+
+def figs_to_png_zip(figs) -> bytes:
+    """ZIP com um PNG por gráfico, renderizados em paralelo (gerado apenas no clique, com cache)."""
+    return _cached_artifact(("png", figs_hash(figs)), lambda: get_renderer().render_zip(figs))
+
+def df_to_excel_file(df, sheet_name: str):
+    """
+    Planilha xlsx com o DataFrame (gerada apenas no clique), aberta do disco.
+    Exportações de dados não entram no cache de arquivos: podem ser grandes.
+    """
+    with stage("gerar excel"):
+        return open_export({sheet_name: df}, "excel")
+
+def datasets_to_file(frames, fmt: str):
+    """Vários DataFrames em um arquivo (xlsx com abas ou ZIP de CSV/Parquet), aberto do disco."""
+    with stage(f"gerar {fmt}"):
+        return open_export(frames, fmt)
 
 def btn(type: str, data, file_name: str, name_btn: str = "Baixar Gráficos"):
-    """Cria um botão de download."""
+    """Cria um botão de download. `data` pode ser uma função, chamada só no clique."""
     st.download_button(
         name_btn,
-        data=data,
+        data=bound(data) if callable(data) else data,
         file_name=file_name,
         mime=DICT_TYPE[type],
+        on_click="ignore",
         use_container_width=True,
         help="Caso tenha dado zoom no gráfico, tente baixar pela própria interface do gráfico."
     )
 
-def btn_download_multiple(figs, file_name_html="plots.html"):
-    """Cria botões de download para múltiplos gráficos Plotly."""
+@timed("btn_download_multiple")
+def btn_download_multiple(figs, file_name_html="plots.html", compress=False):
+    """
+    Cria botões de download para múltiplos gráficos Plotly.
+    Com compress=True o HTML é baixado compactado (.html.gz).
+    """
     col1, col2 = st.columns(2, vertical_alignment="center")
 
-    # HTML
+    # HTML (plotly.js embutido uma única vez)
     with col1:
-        html = "".join([convert_fig_to_html(fig) for fig in figs])
-        btn("html", html, file_name=file_name_html, name_btn="Baixar Gráficos (HTML)")
+        if compress:
+            btn("gzip", lambda: figs_to_html(figs, compress=True), file_name=f"{file_name_html}.gz", name_btn="Baixar Gráficos (HTML)")
+        else:
+            btn("html", lambda: figs_to_html(figs), file_name=file_name_html, name_btn="Baixar Gráficos (HTML)")
 
     # PNG - ZIP (só se puder)
-    zip_buffer = io.BytesIO()
-    has_png = False
-    with zipfile.ZipFile(zip_buffer, "a", zipfile.ZIP_DEFLATED, False) as zf:
-        for i, fig in enumerate(figs):
-            png_bytes = fig_to_png_bytes(fig)
-            if png_bytes:
-                zf.writestr(f"grafico_{i+1}.png", png_bytes.getvalue())
-                has_png = True
-
-    if has_png:
-        zip_buffer.seek(0)
-        with col2:
-            btn("png", zip_buffer, file_name="graficos.zip", name_btn="Baixar Gráficos (PNG)")
-    else:
-        with col2:
+    with col2:
+        if png_available():
+            btn("png", lambda: figs_to_png_zip(figs), file_name="graficos.zip", name_btn="Baixar Gráficos (PNG)")
+        else:
             st.info("Download de PNG não disponível no Streamlit Cloud. Use HTML ou utilize a função de download presente na interface do gráfico.")
 
+@timed("btn_download_excel")
 def btn_download_excel(df, file_name, label="Baixar Dados em Excel"):
     """Cria um botão de download para um DataFrame em formato Excel."""
-    buffer = io.BytesIO()
-    with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-        df.to_excel(
-            writer,
-            sheet_name=file_name.replace('.xlsx','').replace('dados_','').replace('_',' ').title().replace(' ','_'),
-            index=False
-        )
+    sheet_name = file_name.replace('.xlsx','').replace('dados_','').replace('_',' ').title().replace(' ','_')
     st.download_button(
         label=label,
-        data=buffer.getvalue(),
+        data=bound(lambda: df_to_excel_file(df, sheet_name)),
         file_name=file_name,
         mime="application/vnd.ms-excel",
+        on_click="ignore",
         use_container_width=True
     )
+
+def btn_download_datasets(frames, file_name="dados_filtrados", label="Baixar Todos os Dados", key="export_datasets"):
+    """
+    Cria um seletor de formato e um botão para baixar vários DataFrames de uma vez.
+    `frames` é um dict nome -> DataFrame ou uma função que o retorna (chamada só no clique).
+    """
+    formatos = {"Excel (uma aba por conjunto)": "excel", "CSV (ZIP)": "csv", "Parquet (ZIP)": "parquet"}
+    escolha = st.selectbox("Formato", options=list(formatos), key=f"{key}_formato")
+    fmt = formatos[escolha]
+    extensao, mime = EXPORT_FORMATS[fmt]
+    st.download_button(
+        label=label,
+        data=bound(lambda: datasets_to_file(frames() if callable(frames) else frames, fmt)),
+        file_name=f"{file_name}.{extensao}",
+        mime=mime,
+        on_click="ignore",
+        key=key,
+        width="stretch"
+    )
@@ -0,0 +1,150 @@
+import math
+import os
+import tempfile
+import weakref
+import zipfile
+from datetime import datetime
+from typing import BinaryIO, Dict
+
+import pandas as pd
+
+# Linhas convertidas por vez; só um bloco fica materializado em objetos Python
+CHUNK_ROWS = 10_000
+
+FORMATS = {
+    "excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("zip", "application/zip"),
+    "parquet": ("zip", "application/zip"),
+}
+
+
+def _chunks(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _sheet_name(name: str) -> str:
+    """Nome de aba válido no Excel (máx. 31 caracteres, sem caracteres proibidos)."""
+    for ch in "[]:*?/\\":
+        name = name.replace(ch, " ")
+    return name[:31]
+
+
+def _cell(value):
+    """Valor aceito pelo xlsxwriter; None para células vazias."""
+    if pd.api.types.is_scalar(value) and pd.isna(value):  # None, NaN, NaT e pd.NA
+        return None
+    if isinstance(value, float) and math.isinf(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value
+
+
+def write_xlsx(frames: Dict[str, pd.DataFrame], path: str, chunk_rows: int = CHUNK_ROWS) -> None:
+    """
+    Escreve cada DataFrame em uma aba usando o modo constant_memory do
+    xlsxwriter: cada linha vai para o disco assim que a próxima começa.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "tmpdir": tempfile.gettempdir()})
+    header_fmt = workbook.add_format({"bold": True})
+    date_fmt = workbook.add_format({"num_format": "dd/mm/yyyy"})
+    try:
+        for name, df in frames.items():
+            ws = workbook.add_worksheet(_sheet_name(name))
+            ws.write_row(0, 0, [str(c) for c in df.columns], header_fmt)
+            row = 1
+            for chunk in _chunks(df, chunk_rows):
+                for values in chunk.itertuples(index=False, name=None):
+                    for col, value in enumerate(values):
+                        value = _cell(value)
+                        if value is None:
+                            continue
+                        if isinstance(value, datetime):
+                            ws.write_datetime(row, col, value, date_fmt)
+                        else:
+                            ws.write(row, col, value)
+                    row += 1
+    finally:
+        workbook.close()
+
+
+def write_csv_zip(frames: Dict[str, pd.DataFrame], path: str, chunk_rows: int = CHUNK_ROWS) -> None:
+    """ZIP com um CSV por DataFrame, escrito em blocos direto no arquivo compactado."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, df in frames.items():
+            with zf.open(f"{name}.csv", "w") as raw:
+                # utf-8-sig para o Excel reconhecer acentos
+                raw.write("\ufeff".encode("utf-8"))
+                header = True
+                for chunk in _chunks(df, chunk_rows):
+                    raw.write(chunk.to_csv(index=False, header=header, date_format="%Y-%m-%d").encode("utf-8"))
+                    header = False
+
+
+def write_parquet_zip(frames: Dict[str, pd.DataFrame], path: str, chunk_rows: int = CHUNK_ROWS) -> None:
+    """ZIP com um Parquet por DataFrame; cada bloco vira um row group."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with tempfile.TemporaryDirectory() as tmp, zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zf:
+        for name, df in frames.items():
+            part = os.path.join(tmp, f"{len(zf.namelist())}.parquet")
+            writer = None
+            try:
+                for chunk in _chunks(df, chunk_rows):
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        # Esquema definido pelo primeiro bloco; os demais são convertidos para ele
+                        writer = pq.ParquetWriter(part, table.schema, compression="zstd")
+                    writer.write_table(table.cast(writer.schema))
+                if writer is None:
+                    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), part)
+            finally:
+                if writer is not None:
+                    writer.close()
+            zf.write(part, f"{name}.parquet")
+            os.remove(part)
+
+
+WRITERS = {"excel": write_xlsx, "csv": write_csv_zip, "parquet": write_parquet_zip}
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def open_export(frames: Dict[str, pd.DataFrame], fmt: str = "excel") -> BinaryIO:
+    """
+    Exporta vários DataFrames em um único arquivo (xlsx com uma aba por
+    conjunto, ou ZIP de CSV/Parquet) montado em disco e o devolve aberto para
+    leitura, sem carregá-lo na memória. O arquivo temporário some quando o
+    objeto devolvido é fechado ou coletado.
+    """
+    suffix = FORMATS[fmt][0]
+    fd, path = tempfile.mkstemp(suffix=f".{suffix}")
+    os.close(fd)
+    try:
+        WRITERS[fmt](frames, path)
+        f = open(path, "rb")
+    except BaseException:
+        _remove(path)
+        raise
+    try:
+        # POSIX: o conteúdo continua acessível pelo arquivo aberto
+        os.remove(path)
+    except OSError:
+        # Windows: um arquivo aberto não pode ser apagado; apaga depois de fechado
+        weakref.finalize(f, _remove, path)
+    return f
+
+
+def export_datasets(frames: Dict[str, pd.DataFrame], fmt: str = "excel") -> bytes:
+    """Conteúdo de open_export(frames, fmt) em bytes."""
+    with open_export(frames, fmt) as f:
+        return f.read()
@@ -0,0 +1,186 @@
+import atexit
+import io
+import logging
+import os
+import signal
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+
+logger = logging.getLogger(__name__)
+
+# 96 dpi corresponde a scale=1 no Kaleido
+BASE_DPI = 96
+
+
+def _warm_up(pids=None):
+    """
+    Inicializa o Kaleido no processo atual (servidor persistente quando
+    disponível) e informa o PID do processo em pids, para o pool poder ser
+    encerrado mesmo com um processo travado.
+    """
+    if pids is not None:
+        pids.put(os.getpid())
+    try:
+        import kaleido
+        if hasattr(kaleido, "start_sync_server"):
+            kaleido.start_sync_server(silence_warnings=True)
+    except Exception as e:  # o próprio render mostrará o erro real
+        logger.debug("Kaleido não pôde ser pré-aquecido: %s", e)
+
+
+def _render(spec: str, width, height, scale: float) -> bytes:
+    """
+    Renderiza o JSON de uma figura em PNG (executado nos processos do pool).
+    width/height None usam o tamanho do layout da figura.
+    """
+    import plotly.io as pio
+    fig = pio.from_json(spec, skip_invalid=True)
+    return pio.to_image(fig, format="png", width=width, height=height, scale=scale)
+
+
+def _as_json(fig) -> str:
+    if isinstance(fig, str):
+        return fig
+    return fig.to_json()
+
+
+class PngRenderer:
+    """
+    Exportador de PNG com processos do Kaleido mantidos aquecidos.
+
+    - workers: número de processos (0 = renderiza no próprio processo)
+    - timeout: tempo máximo por figura, em segundos
+    - width/height: tamanho em pixels CSS (None = o do layout de cada figura);
+      dpi define a escala (dpi / 96)
+
+    Figuras que falham ou estouram o tempo voltam como None e são registradas
+    no log. Um timeout descarta o pool, que é recriado no próximo uso; as
+    figuras que já estavam prontas são devolvidas mesmo assim.
+    """
+
+    def __init__(self, workers=None, timeout: float = 30.0, width=None, height=None, dpi: int = BASE_DPI):
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
+        self.workers = workers
+        self.timeout = timeout
+        self.width = width
+        self.height = height
+        self.dpi = dpi
+        self._executor = None
+        self._pids = None
+        self._lock = threading.Lock()
+
+    @property
+    def scale(self) -> float:
+        return self.dpi / BASE_DPI
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context("spawn")
+                self._pids = context.SimpleQueue()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_warm_up,
+                    initargs=(self._pids,),
+                )
+            return self._executor
+
+    def _discard_pool(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            pids, self._pids = self._pids, None
+        if executor is None:
+            return
+        executor.shutdown(wait=False, cancel_futures=True)
+        # Processos travados não terminam sozinhos; encerra-os pelos PIDs informados em _warm_up
+        while pids is not None and not pids.empty():
+            try:
+                os.kill(pids.get(), signal.SIGTERM)
+            except OSError:  # já encerrado
+                pass
+
+    @staticmethod
+    def _completed(futures) -> list:
+        """Resultado das figuras já prontas; None para as que não terminaram ou falharam."""
+        return [
+            future.result() if future.done() and not future.cancelled() and future.exception() is None else None
+            for future in futures
+        ]
+
+    def render(self, figs) -> list:
+        """PNG (bytes) de cada figura, na mesma ordem; None para as que falharam."""
+        specs = [_as_json(fig) for fig in figs]
+        if self.workers == 0:
+            return [self._render_local(spec) for spec in specs]
+
+        pool = self._pool()
+        futures = [pool.submit(_render, spec, self.width, self.height, self.scale) for spec in specs]
+        results = []
+        # Cada figura tem `timeout` segundos a partir do momento em que um processo fica livre para ela
+        deadline = time.monotonic()
+        for i, future in enumerate(futures):
+            if i % self.workers == 0:
+                deadline += self.timeout
+            try:
+                results.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+            except FutureTimeout:
+                logger.warning("PNG do gráfico %d excedeu %.0fs", i + 1, self.timeout)
+                results.extend(self._completed(futures[i:]))
+                self._discard_pool()
+                break
+            except BrokenProcessPool as e:
+                logger.warning("Processos de PNG encerrados inesperadamente: %s", e)
+                results.extend(self._completed(futures[i:]))
+                self._discard_pool()
+                break
+            except Exception as e:
+                logger.warning("PNG do gráfico %d não gerado: %s", i + 1, e)
+                results.append(None)
+        return results
+
+    def _render_local(self, spec: str):
+        try:
+            return _render(spec, self.width, self.height, self.scale)
+        except Exception as e:
+            logger.warning("PNG não gerado: %s", e)
+            return None
+
+    def render_zip(self, figs, prefix: str = "grafico") -> bytes:
+        """ZIP com um PNG por figura renderizada com sucesso."""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            for i, png in enumerate(self.render(figs), start=1):
+                if png:
+                    zf.writestr(f"{prefix}_{i}.png", png)
+        return buffer.getvalue()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._pids = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer() -> PngRenderer:
+    """Renderizador compartilhado pelo processo (configurável por variáveis de ambiente)."""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = PngRenderer(
+                workers=int(os.environ["PNG_WORKERS"]) if "PNG_WORKERS" in os.environ else None,
+                timeout=float(os.environ.get("PNG_TIMEOUT", 30)),
+                dpi=int(os.environ.get("PNG_DPI", BASE_DPI)),
+            )
+            atexit.register(_renderer.shutdown)
+        return _renderer
@@ -0,0 +1,96 @@
+import base64
+import gzip
+import html
+import json
+import numbers
+
+import numpy as np
+
+# Listas numéricas menores que isso ficam em JSON (o base64 não compensa)
+MIN_TYPED_ARRAY = 8
+
+
+def _typed_array(values):
+    """Converte uma lista de números no formato binário (base64) do plotly.js."""
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iu" and arr.size and np.abs(arr).max() < 2**31:
+        arr = arr.astype("<i4")
+        dtype = "i4"
+    else:
+        arr = arr.astype("<f8")
+        dtype = "f8"
+    return {"dtype": dtype, "bdata": base64.b64encode(arr.tobytes()).decode("ascii")}
+
+
+def _is_number_list(value) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) >= MIN_TYPED_ARRAY
+        and all(
+            isinstance(v, numbers.Real) and not isinstance(v, bool)
+            for v in value
+        )
+    )
+
+
+def _compact(obj):
+    """Troca listas numéricas do spec por arrays tipados, recursivamente."""
+    if isinstance(obj, dict):
+        return {k: _compact(v) for k, v in obj.items()}
+    if _is_number_list(obj):
+        return _typed_array(obj)
+    if isinstance(obj, list):
+        return [_compact(v) for v in obj]
+    return obj
+
+
+def fig_spec(fig) -> dict:
+    """
+    Especificação (dict) de um gráfico. Aceita uma figura Plotly, um dict já
+    serializado ou a string JSON da figura.
+    """
+    if isinstance(fig, dict):
+        return fig
+    if isinstance(fig, str):
+        return json.loads(fig)
+    return json.loads(fig.to_json())
+
+
+def _script_json(obj) -> str:
+    """JSON compacto seguro para ser embutido em uma tag <script>."""
+    return json.dumps(obj, separators=(",", ":")).replace("</", "<\\/")
+
+
+def build_html_report(figs, title: str = "Gráficos", compress: bool = False) -> bytes:
+    """
+    Gera um único documento HTML autocontido com todos os gráficos.
+
+    - o plotly.js é embutido uma única vez (funciona offline, sem CDN)
+    - os dados numéricos dos traces vão como arrays tipados em base64
+    - compress=True devolve o HTML compactado com gzip (.html.gz)
+    """
+    from plotly.offline import get_plotlyjs
+
+    divs = []
+    for i, fig in enumerate(figs, start=1):
+        spec = fig_spec(fig)
+        div_id = f"grafico-{i}"
+        height = spec.get("layout", {}).get("height") or 500
+        divs.append(
+            f'<div id="{div_id}" class="plotly-graph-div" style="height:{height}px;width:100%;"></div>\n'
+            f"<script>Plotly.newPlot({json.dumps(div_id)}, "
+            f"{_script_json(_compact(spec.get('data', [])))}, "
+            f"{_script_json(spec.get('layout', {}))}, "
+            '{"responsive": true, "displaylogo": false});</script>'
+        )
+
+    document = (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{html.escape(title)}</title>\n"
+        f"<script type=\"text/javascript\">{get_plotlyjs()}</script>\n"
+        "</head>\n<body>\n" + "\n".join(divs) + "\n</body>\n</html>\n"
+    ).encode("utf-8")
+
+    if compress:
+        return gzip.compress(document, mtime=0)
+    return document
@@ -0,0 +1,18 @@
+from .figures import FL_TIPOS, VOLUME_BARRAS, FL_WEBGL_MIN_POINTS, FL_HEATMAP_MIN_POINTS, fl_render_mode, fig_fl, fig_volume_acumulado, fig_volume_barras
+from .views import ACUMULADO, PONTOS_POR_GRAFICO, fl_chart_frame, volume_chart_frame, fig_acumulado
+
+__all__ = [
+    "FL_TIPOS",
+    "VOLUME_BARRAS",
+    "FL_WEBGL_MIN_POINTS",
+    "FL_HEATMAP_MIN_POINTS",
+    "fl_render_mode",
+    "fig_fl",
+    "fig_volume_acumulado",
+    "fig_volume_barras",
+    "ACUMULADO",
+    "PONTOS_POR_GRAFICO",
+    "fl_chart_frame",
+    "volume_chart_frame",
+    "fig_acumulado",
+]
@@ -0,0 +1,119 @@
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+# plotly.express (~0,3s para importar) é carregado só ao montar o primeiro gráfico
+
+# Tipos do FL e títulos dos gráficos
+FL_TIPOS = {
+    'NA (m)': 'Nível de Água (NA)',
+    'NO (m)': 'Nível de Óleo (NO)',
+    'Esp. (m)': 'Espessura de Óleo',
+}
+
+# Colunas de volume em barras: título e cor
+VOLUME_BARRAS = {
+    'Volume Removido SAO (L)': ('Volume Removido SAO ao Longo do Tempo', '#156082'),
+    'Volume Removido Bailer (L)': ('Volume Removido Bailer ao Longo do Tempo', '#e17b7b'),
+    'Volume Bombeado (L)': ('Volume Bombeado ao Longo do Tempo', '#156082'),
+}
+
+
+# Pontos (valores não nulos) a partir dos quais o FL deixa as barras SVG
+FL_WEBGL_MIN_POINTS = 2_000
+FL_HEATMAP_MIN_POINTS = 50_000
+
+
+def fl_render_mode(n_points: int, webgl_min_points: int = FL_WEBGL_MIN_POINTS, heatmap_min_points: int = FL_HEATMAP_MIN_POINTS) -> str:
+    """Modo de desenho do FL conforme o volume de dados: 'bar', 'webgl' ou 'heatmap'."""
+    if n_points >= heatmap_min_points:
+        return "heatmap"
+    if n_points >= webgl_min_points:
+        return "webgl"
+    return "bar"
+
+
+def _fig_fl_bar(df, tipo):
+    """Barras agrupadas por poço (SVG)."""
+    import plotly.express as px
+    return px.bar(
+        df,
+        x='Data',
+        y=tipo,
+        color='Poço',
+        title=FL_TIPOS[tipo],
+        color_discrete_sequence=qualitative.Dark24,
+        barmode='group'
+    )
+
+
+def _fig_fl_webgl(df, tipo):
+    """Uma linha WebGL (scattergl) por poço."""
+    cores = qualitative.Dark24
+    fig = go.Figure()
+    for i, (poco, dados) in enumerate(df.groupby('Poço', sort=False, observed=True)):
+        dados = dados.loc[dados[tipo].notna()]
+        fig.add_trace(go.Scattergl(
+            x=dados['Data'],
+            y=dados[tipo],
+            name=str(poco),
+            mode='lines+markers',
+            marker=dict(size=4, color=cores[i % len(cores)]),
+            line=dict(width=1, color=cores[i % len(cores)]),
+        ))
+    fig.update_layout(title=FL_TIPOS[tipo], xaxis_title='Data', yaxis_title=tipo)
+    return fig
+
+
+def _fig_fl_heatmap(df, tipo):
+    """Mapa de calor poço x data (os dados já chegam agregados por período)."""
+    pocos = list(dict.fromkeys(df['Poço']))
+    grade = df.pivot_table(index='Poço', columns='Data', values=tipo, aggfunc='mean', observed=True).reindex(pocos)
+    fig = go.Figure(go.Heatmap(
+        z=grade.to_numpy(),
+        x=grade.columns,
+        y=[str(p) for p in grade.index],
+        colorscale='Viridis',
+        colorbar=dict(title=tipo),
+        hoverongaps=False,
+    ))
+    fig.update_layout(title=FL_TIPOS[tipo], xaxis_title='Data', yaxis_title='Poço')
+    return fig
+
+
+def fig_fl(df, tipo, mode=None, webgl_min_points=FL_WEBGL_MIN_POINTS, heatmap_min_points=FL_HEATMAP_MIN_POINTS):
+    """
+    Gráfico de um tipo do FL (NA, NO ou Esp.) por poço.
+
+    Seleções pequenas mantêm as barras agrupadas; acima de webgl_min_points
+    pontos usa linhas WebGL e acima de heatmap_min_points um mapa de calor
+    poço x data. `mode` ('bar', 'webgl', 'heatmap') força um dos modos.
+    """
+    if mode is None:
+        mode = fl_render_mode(int(df[tipo].notna().sum()), webgl_min_points, heatmap_min_points)
+    if mode == "heatmap":
+        fig = _fig_fl_heatmap(df, tipo)
+    elif mode == "webgl":
+        fig = _fig_fl_webgl(df, tipo)
+    else:
+        fig = _fig_fl_bar(df, tipo)
+    fig.update_layout(dragmode='zoom', xaxis_tickangle=-45, legend_title_text='Poços')
+    return fig
+
+
+def fig_volume_acumulado(df, y='Volume Acumulado (L)'):
+    """Linha do volume acumulado ao longo do tempo."""
+    import plotly.express as px
+    return px.line(df, x='Data', y=y, title='Volume Acumulado ao Longo do Tempo', color_discrete_sequence=['#c44d15'])
+
+
+def fig_volume_barras(df, y):
+    """Barras de uma coluna de volume ao longo do tempo."""
+    import plotly.express as px
+    title, color = VOLUME_BARRAS[y]
+    return px.bar(
+        df,
+        x='Data',
+        y=y,
+        title=title,
+        color_discrete_sequence=[color]
+    )
@@ -0,0 +1,33 @@
+# Dados e figuras das views do dashboard a partir de DailyRollup/CumulativeVolume,
+# compartilhados pela página e pelo relatório em lote (batch_report.py)
+from utils import downsample
+
+from .figures import FL_TIPOS, fig_volume_acumulado
+
+ACUMULADO = 'Volume Acumulado (L)'
+
+# Pontos enviados por linha longa (~1 por pixel de largura do gráfico)
+PONTOS_POR_GRAFICO = 1200
+
+
+def fl_chart_frame(rollup, start, end, freq, wells=None):
+    """Média de cada tipo do FL por poço e período (wells=None: todos os poços)."""
+    return rollup.query(start, end, freq, {t: 'mean' for t in FL_TIPOS}, groups=wells)
+
+
+def volume_chart_frame(rollup, cumulative, start, end, freq, restart=True):
+    """
+    Soma por período das colunas do rollup (períodos sem registro = 0) e o
+    volume acumulado no fechamento de cada período.
+    """
+    df = rollup.query(start, end, freq, {c: 'sum' for c in rollup.value_cols})
+    df[ACUMULADO] = cumulative.periods(df['Data'], start, end, restart=restart)
+    return df
+
+
+def fig_acumulado(df, x_range=None, points=PONTOS_POR_GRAFICO):
+    """
+    Linha do volume acumulado reduzida por LTTB. Com x_range (faixa escolhida
+    no gráfico), a redução é refeita só dentro dela (resolução total se couber).
+    """
+    return fig_volume_acumulado(downsample(df, 'Data', ACUMULADO, points, x_range=x_range))
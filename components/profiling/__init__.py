@@ -0,0 +1,5 @@
+from .panel import profiling_panel
+
+__all__ = [
+    "profiling_panel",
+]
@@ -0,0 +1,50 @@
+from typing import Dict, Optional
+
+import pandas as pd
+import streamlit as st
+
+COLUNAS_EXECUCAO = ["stage", "seconds", "rows_in", "rows_out", "mem_delta", "error"]
+
+
+def profiling_panel(profiler, key: str = "perfil", caches: Optional[Dict[str, dict]] = None):
+    """
+    Painel da sidebar com os tempos das etapas (StageProfiler): a última
+    execução completa, os percentis por etapa e o download em JSON lines.
+    caches (nome -> stats()) aparece em uma tabela com os contadores de cada cache.
+    Deve ser exibido só para administradores.
+    """
+    with st.sidebar.expander("Desempenho por Etapa", expanded=False):
+        profiler.enabled = st.toggle("Medir etapas", value=profiler.enabled, key=f"{key}_ativo")
+        if caches:
+            st.write("**Caches**")
+            st.dataframe(pd.DataFrame(caches).T, width="stretch")
+        run = profiler.last_complete_run()
+        if run is None:
+            st.caption("Nenhuma execução medida ainda.")
+            return
+
+        st.write(f"**Última execução** (#{run})")
+        ultima = pd.DataFrame(profiler.records(run), columns=COLUNAS_EXECUCAO)
+        # None onde a memória residente não pode ser lida (fora do Linux)
+        ultima["mem_delta"] = pd.to_numeric(ultima["mem_delta"], errors="coerce") / 2**20
+        st.dataframe(
+            ultima.rename(columns={"mem_delta": "mem (MB)"}),
+            hide_index=True,
+            width="stretch",
+            column_config={"seconds": st.column_config.NumberColumn(format="%.4f"), "mem (MB)": st.column_config.NumberColumn(format="%.1f")},
+        )
+        st.write(f"**Total:** {ultima['seconds'].sum():.3f}s")
+
+        st.write("**Percentis (s)**")
+        st.dataframe(pd.DataFrame(profiler.summary()), hide_index=True, width="stretch")
+
+        col1, col2 = st.columns(2)
+        col1.download_button(
+            "Baixar JSONL",
+            data=profiler.to_jsonl,
+            file_name="etapas.jsonl",
+            mime="application/jsonl",
+            on_click="ignore",
+            key=f"{key}_jsonl",
+        )
+        col2.button("Limpar", on_click=profiler.clear, key=f"{key}_limpar")
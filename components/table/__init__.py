@@ -0,0 +1,7 @@
+from .paginated_table import PAGE_SIZES, paginated_table, page_slice
+
+__all__ = [
+    "PAGE_SIZES",
+    "paginated_table",
+    "page_slice",
+]
@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 250]
+SEM_FILTRO = "(sem filtro)"
+
+
+def _order(df: pd.DataFrame, sort_col, ascending: bool, filter_col, filter_value: str) -> np.ndarray:
+    """Posições das linhas do DataFrame depois do filtro e da ordenação."""
+    positions = np.arange(len(df))
+    if filter_col and filter_value:
+        col = df[filter_col]
+        if pd.api.types.is_numeric_dtype(col) or pd.api.types.is_datetime64_any_dtype(col):
+            text = col.astype(str)
+        else:
+            text = col.astype("string")
+        mask = text.str.contains(filter_value, case=False, regex=False, na=False).to_numpy()
+        positions = positions[mask]
+    if sort_col:
+        values = df[sort_col].iloc[positions]
+        # Ordenação estável; valores vazios sempre no fim
+        order = values.reset_index(drop=True).sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+        positions = positions[order]
+    return positions
+
+
+def page_slice(positions: np.ndarray, page: int, page_size: int) -> np.ndarray:
+    """Posições da página (1-based) dentro da ordem já calculada."""
+    start = (page - 1) * page_size
+    return positions[start:start + page_size]
+
+
+def paginated_table(df: pd.DataFrame, key: str, version=None, page_size: int = 50):
+    """
+    Tabela paginada no servidor: só a página visível e as colunas escolhidas
+    são enviadas ao navegador, então o tamanho da resposta não depende do
+    número de linhas.
+
+    Filtro (texto contido em uma coluna) e ordenação são feitos aqui, sobre o
+    DataFrame já carregado. A ordem resultante fica guardada na sessão para a
+    combinação (version, ordenação, filtro): trocar de página não a recalcula.
+    `version` deve mudar sempre que o conteúdo de `df` mudar (ex.: versão dos
+    dados + período filtrado).
+    """
+    colunas = list(df.columns)
+    with st.expander("Colunas, ordenação e filtro", expanded=False):
+        c1, c2, c3 = st.columns([2, 1, 1])
+        visiveis = c1.multiselect("Colunas", options=colunas, default=colunas, key=f"{key}_colunas")
+        sort_col = c2.selectbox("Ordenar por", options=[None] + colunas, format_func=lambda c: "-" if c is None else c, key=f"{key}_ordem")
+        ascending = c3.radio("Sentido", options=["Crescente", "Decrescente"], horizontal=True, key=f"{key}_sentido") == "Crescente"
+        f1, f2 = st.columns([1, 2])
+        filter_col = f1.selectbox("Filtrar coluna", options=[SEM_FILTRO] + colunas, key=f"{key}_filtro_coluna")
+        filter_value = f2.text_input("Contém", key=f"{key}_filtro_valor").strip()
+    if filter_col == SEM_FILTRO:
+        filter_col = None
+
+    cache_key = (version, len(df), sort_col, ascending, filter_col, filter_value)
+    cached = st.session_state.get(f"{key}_posicoes")
+    if version is None or cached is None or cached[0] != cache_key:
+        positions = _order(df, sort_col, ascending, filter_col, filter_value)
+        st.session_state[f"{key}_posicoes"] = (cache_key, positions)
+        if cached is not None and cached[0][2:] != cache_key[2:]:
+            # Nova ordenação/filtro: volta para a primeira página
+            st.session_state[f"{key}_pagina"] = 1
+    else:
+        positions = cached[1]
+
+    total = len(positions)
+    p1, p2, p3 = st.columns([1, 1, 2], vertical_alignment="bottom")
+    tamanho = p1.selectbox("Linhas por página", options=PAGE_SIZES, index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 0, key=f"{key}_tamanho")
+    n_paginas = max(1, math.ceil(total / tamanho))
+    # Filtro ou período menor podem deixar a página atual fora do intervalo
+    if st.session_state.get(f"{key}_pagina", 1) > n_paginas:
+        st.session_state[f"{key}_pagina"] = n_paginas
+    inicial = {} if f"{key}_pagina" in st.session_state else {"value": 1}
+    pagina = p2.number_input("Página", min_value=1, max_value=n_paginas, step=1, key=f"{key}_pagina", **inicial)
+
+    pagina_pos = page_slice(positions, int(pagina), tamanho)
+    st.dataframe(df.iloc[pagina_pos][visiveis or colunas], width="stretch", hide_index=True)
+    inicio = (int(pagina) - 1) * tamanho
+    p3.caption(f"Linhas {inicio + 1 if total else 0}–{inicio + len(pagina_pos)} de {total}")
@@ -1,18 +1,43 @@
+import functools
 import streamlit as st
 import pandas as pd
-import io
 import os
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
-import plotly.express as px
-from utils import tratando_df, fillna_columns, add_accumulated_column, filter_by_date
-from components.btn import btn_download_multiple, btn_download_excel
+from utils import fillna_columns, granularity_to_freq, filter_by_date, get_shared_cache, DatasetLease, DataStore, content_hash, load_workbook, load_stored, merge_sources, WellIndex, DailyRollup, CumulativeVolume, volume_kpis, days_since, FigureCache, memory_report, StageProfiler, activate, stage
+from utils.auth import is_admin
+from components.btn import btn_download_multiple, btn_download_excel, btn_download_datasets
+from components.table import paginated_table
+from components.profiling import profiling_panel
+from components.charts import FL_TIPOS, fig_fl, fig_volume_barras, fig_acumulado, fl_chart_frame, volume_chart_frame
 
 # Helpers para limpar filtros via callbacks
 def _clear_state_key(key: str):
     st.session_state[key] = []
 
+# Zoom do acumulado: a seleção em caixa (ferramenta "Box Select") refaz a redução
+# só na faixa escolhida. A faixa fica em `{key}_zoom` e não no estado do gráfico,
+# que o Streamlit descarta quando a figura muda; vale até "Restaurar zoom".
+# O arrastar padrão do Plotly continua sendo o zoom local do navegador.
+def _guardar_zoom(key: str):
+    """Callback da seleção no gráfico `key`: guarda a faixa do eixo x selecionada."""
+    try:
+        x = st.session_state[key]["selection"]["box"][0]["x"]
+    except (KeyError, IndexError, TypeError):
+        return
+    if x:
+        st.session_state[f"{key}_zoom"] = (min(x), max(x))
+
+def _limpar_zoom(key: str):
+    st.session_state.pop(f"{key}_zoom", None)
+
+def _faixa_zoom(key: str):
+    """Faixa do eixo x guardada para o gráfico `key`, ou None."""
+    return st.session_state.get(f"{key}_zoom")
+
+def _botao_zoom(key: str):
+    """Botão "Restaurar zoom", exibido só enquanto há uma faixa guardada."""
+    if _faixa_zoom(key) is not None:
+        st.button("Restaurar zoom", key=f"{key}_zoom_reset", on_click=_limpar_zoom, kwargs={"key": key})
+
 # Inicializa os DataFrames como None para evitar NameError
 df_fl = None
 df_volume_produto = None
@@ -21,8 +46,8 @@ df_volume = None
 # Variáveis Globais
 DATA_DIR = os.path.join(os.getcwd(), 'data')
 
-if not os.path.exists(DATA_DIR):
-    os.makedirs(DATA_DIR)
+# Planilhas já ingeridas ficam salvas em formato colunar (Arrow) em DATA_DIR
+data_store = DataStore(DATA_DIR)
 
 
 def card(kpi_titulo: str, kpi_valor: int, emoji: str = "", color: str = "#5A2781"):
@@ -49,37 +74,113 @@ upload_file = st.sidebar.file_uploader("Upload do Arquivo", type=["csv", "xlsx"]
 
 # st.write("*OBS: O arquivo pegará apenas a primeira página, se tiver múltiplas páginas.*")
 
-if upload_file is not None:
-    for uploaded_file in upload_file:
-        # DF Vendas
-        df_volume = pd.read_excel(uploaded_file, sheet_name="Volume Bombeado", engine='openpyxl')
-        df_volume = tratando_df(df_volume)
+# Planilhas já processadas, compartilhadas entre as sessões (chave = hash do conteúdo do arquivo)
+shared_cache = get_shared_cache()
+if "dataset_lease" not in st.session_state:
+    st.session_state["dataset_lease"] = DatasetLease(shared_cache)
+dataset_lease = st.session_state["dataset_lease"]
+
+# Cache de figuras já montadas (chave = versão dos dados + estado dos filtros)
+if "figure_cache" not in st.session_state:
+    st.session_state["figure_cache"] = FigureCache(max_bytes=64 * 1024 * 1024)
+figure_cache = st.session_state["figure_cache"]
+
+# Tempos das etapas a cada execução (ligado pelo painel de administração ou PROFILE_STAGES=1)
+if "stage_profiler" not in st.session_state:
+    st.session_state["stage_profiler"] = StageProfiler(enabled=is_admin() and os.environ.get("PROFILE_STAGES") == "1")
+stage_profiler = st.session_state["stage_profiler"]
+stage_profiler.begin_run()
+activate(stage_profiler)
+st.session_state["_execucao_completa"] = True
+if is_admin():
+    profiling_panel(stage_profiler, caches={"Planilhas (processo)": shared_cache.stats(), "Figuras (sessão)": figure_cache.stats()})
+
+def _kpis(nome: str, construir):
+    """
+    KPIs dos cards, calculados uma vez por versão dos dados e janela de datas.
+    Só a última janela de cada view é guardada.
+    """
+    janela = (data_inicio, data_fim, acumulado_global)
+    ultimo = workbook_merger.cached(f"kpis:{nome}", dict)
+    if ultimo.get("janela") != janela:
+        ultimo["valor"] = construir()
+        ultimo["janela"] = janela
+    return ultimo["valor"]
+
+def _derivado(nome: str, construir):
+    """Índice/rollup/acumulado da versão atual dos dados, um só para todas as sessões com a mesma versão."""
+    return workbook_merger.cached(nome, lambda: shared_cache.derived(workbook_merger.version, nome, construir))
+
+def _figura(chave: tuple, construir):
+    """Figura do cache; `construir` só é chamada se a combinação de filtros for nova."""
+    with stage(f"figura {chave[0]}"):
+        return figure_cache.get_or_build((workbook_merger.version,) + chave, construir)
+
+# Cada fonte é (hash do conteúdo, função que carrega as abas)
+fontes = []
+for uploaded_file in upload_file:
+    conteudo = uploaded_file.getvalue()
+    chave = content_hash(conteudo)
+    fontes.append((chave, lambda conteudo=conteudo, chave=chave, nome=uploaded_file.name: shared_cache.get_or_load(chave, lambda: load_workbook(conteudo, store=data_store, name=nome, key=chave))))
+
+# --------- Dados Salvos ---------
+# Sem upload, permite abrir conjuntos de dados ingeridos anteriormente
+if not fontes:
+    datasets_salvos = {meta["id"]: meta for meta in data_store.list_datasets()}
+    if datasets_salvos:
+        st.sidebar.write("## Dados Salvos")
+        datasets_escolhidos = st.sidebar.multiselect(
+            "Selecione os conjuntos de dados",
+            options=list(datasets_salvos),
+            format_func=lambda d: f"{datasets_salvos[d]['name']} ({datasets_salvos[d]['created'][:10]})",
+            key="datasets_salvos"
+        )
+        for chave in datasets_escolhidos:
+            fontes.append((chave, lambda chave=chave: shared_cache.get_or_load(chave, lambda: load_stored(chave, data_store))))
 
-        # DF Volume Produto
-        df_volume_produto = pd.read_excel(uploaded_file, sheet_name="Volume Produto", engine='openpyxl')
-        df_volume_produto = tratando_df(df_volume_produto)
-        
-        # DF FL
-        df_fl = pd.read_excel(uploaded_file, sheet_name="FL", engine='openpyxl')
-        df_fl = tratando_df(df_fl)
+# Reserva as planilhas desta sessão no cache compartilhado (as que saíram são liberadas)
+dataset_lease.hold(chave for chave, _ in fontes)
 
-        # DF Hidrogeológicos
-        df_hidrometros = pd.read_excel(uploaded_file, sheet_name="Hidrômetros", engine='openpyxl')
-        df_hidrometros = tratando_df(df_hidrometros)
+# Junta as planilhas incrementalmente: só arquivos novos são processados
+st.session_state["workbook_merger"] = merge_sources(st.session_state.get("workbook_merger"), fontes)
+workbook_merger = st.session_state["workbook_merger"]
 
-        # DF Coleta
-        # df_coleta = pd.read_excel(uploaded_file, sheet_name="Coleta", engine='openpyxl')
-        # df_coleta = tratando_df(df_coleta)
-        
+if fontes:
+    frames = workbook_merger.frames()
+
+    # DF Vendas
+    df_volume = frames.get("Volume Bombeado")
+
+    # DF Volume Produto
+    df_volume_produto = frames.get("Volume Produto")
+
+    # DF FL
+    df_fl = frames.get("FL")
 
-        # Visualizar DataFrame
-        # st.write(df_fl)
-        # st.write(df_volume_produto)
-        # st.write(df_volume)
+    # DF Hidrogeológicos
+    df_hidrometros = frames.get("Hidrômetros")
+
+    # DF Coleta
+    # df_coleta = pd.read_excel(uploaded_file, sheet_name="Coleta", engine='openpyxl')
+    # df_coleta = tratando_df(df_coleta)
 
 
     # Visualizar Dev
     with st.expander("Visualizar DataFrame"):
+        st.write("### Cache de Planilhas (compartilhado)")
+        st.write(shared_cache.stats())
+        st.write("### Cache de Figuras")
+        st.write(figure_cache.stats())
+        st.write(f"Planilhas combinadas: {len(workbook_merger)} | Linhas duplicadas descartadas: {workbook_merger.duplicates}")
+
+        st.write("### Memória por Aba")
+        st.write({aba: f"{n / 2**20:.2f} MB" for aba, n in memory_report(frames).items()})
+        relatorios = {chave: data_store.meta(chave).get("report") for chave in workbook_merger.sources if data_store.exists(chave)}
+        for chave, relatorio in relatorios.items():
+            if relatorio:
+                st.write(f"Ingestão de {data_store.meta(chave)['name']} (células inválidas e memória antes/depois dos tipos compactos)")
+                st.dataframe(pd.DataFrame(relatorio).T, width="stretch")
+
         st.write("### DataFrame FL Informações")
         if df_fl is not None:
             st.write(df_fl.columns)
@@ -102,6 +203,304 @@ if upload_file is not None:
             st.write("Nenhum dado carregado para Volume Bombeado.")
 
 
+# ---------------------- Painéis -----------------------
+# Cada view é um fragmento: mudar poços, tipos, colunas, zoom ou a página da
+# tabela reexecuta só o painel, sem upload, filtros da sidebar e exportação.
+# A faixa de datas e a granularidade (sidebar) reexecutam a página inteira e
+# chegam aos painéis como argumentos; as figuras e KPIs já calculados para
+# a mesma combinação continuam no cache.
+def _painel(fn):
+    """Roda fn como fragmento; cada reexecução só do painel conta como uma execução no profiler."""
+    @st.fragment
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not st.session_state.pop("_execucao_completa", False):
+            stage_profiler.begin_run()
+            activate(stage_profiler)
+        return fn(*args, **kwargs)
+    return wrapper
+
+@_painel
+def _painel_fl(df_fl, data_inicio, data_fim, freq):
+    st.write("## Gráficos de Fase Livre")
+
+    # Índice por poço (construído uma vez por conjunto de dados)
+    fl_index = _derivado("fl_index", lambda: WellIndex(df_fl, 'Poço', 'Data'))
+
+    # Filtros de Poços
+    filtroCol1, filtroCol2 = st.columns(2)
+    pocos = fl_index.wells
+
+    if "filtro_pocos" not in st.session_state:
+        st.session_state["filtro_pocos"] = [pocos[0]]
+
+    pocos_col1, pocos_col2 = filtroCol1.columns([3,1], vertical_alignment="center")
+    poço_selecionado = pocos_col1.multiselect(
+        "Selecione os Poços",
+        options=pocos,
+        default=st.session_state["filtro_pocos"] if st.session_state["filtro_pocos"] else [pocos[0]],
+        key="filtro_pocos"
+    )
+    pocos_col2.button("Limpar", key="btn_limpar_pocos", on_click=_clear_state_key, kwargs={"key":"filtro_pocos"})
+
+    if poço_selecionado:
+        # Junta apenas os blocos dos poços escolhidos, já filtrados por data
+        df_fl = fl_index.select(poço_selecionado, data_inicio, data_fim)
+        # Média por poço em cada período, derivada do cubo diário (sem reagrupar as linhas brutas)
+        fl_rollup = _derivado("fl_rollup", lambda: DailyRollup(fl_index.frame, FL_TIPOS, 'Data', 'Poço'))
+        df_fl_grafico = fl_chart_frame(fl_rollup, data_inicio, data_fim, freq, poço_selecionado)
+        # Preencher NaN
+        df_fl = fillna_columns(df_fl, ['NA (m)', 'NO (m)', 'Esp. (m)'], 0)
+    else:
+        st.warning("Por favor, selecione pelo menos um poço.")
+        return
+
+    # Filtros de Tipo
+    tipo = ['NA (m)','NO (m)','Esp. (m)']
+    if "filtro_tipos" not in st.session_state:
+        st.session_state["filtro_tipos"] = [tipo[0]]
+
+    tipos_col1, tipos_col2 = filtroCol2.columns([3,1], vertical_alignment="center")
+    tipo_selecionado = tipos_col1.multiselect(
+        "Selecione o Tipo",
+        options=tipo,
+        default=st.session_state["filtro_tipos"] if st.session_state["filtro_tipos"] else [tipo[0]],
+        key="filtro_tipos"
+    )
+    if not tipo_selecionado:
+        st.warning("Por favor, selecione pelo menos um tipo.")
+        return
+    tipos_col2.button("Limpar", key="btn_limpar_tipos", on_click=_clear_state_key, kwargs={"key":"filtro_tipos"})
+
+    # Criar figuras
+    figuras = []
+
+    if 'NA (m)' in tipo_selecionado:
+        fig_na = _figura(("fl", 'NA (m)', data_inicio, data_fim, freq, tuple(poço_selecionado)), lambda: fig_fl(df_fl_grafico, 'NA (m)'))
+        figuras.append(fig_na)
+
+    if 'NO (m)' in tipo_selecionado:
+        fig_no = _figura(("fl", 'NO (m)', data_inicio, data_fim, freq, tuple(poço_selecionado)), lambda: fig_fl(df_fl_grafico, 'NO (m)'))
+        figuras.append(fig_no)
+
+    if 'Esp. (m)' in tipo_selecionado:
+        fig_esp = _figura(("fl", 'Esp. (m)', data_inicio, data_fim, freq, tuple(poço_selecionado)), lambda: fig_fl(df_fl_grafico, 'Esp. (m)'))
+        figuras.append(fig_esp)
+
+    # Exibir gráficos
+    n_figs = len(figuras)
+    if n_figs == 3:
+        col1, col2 = st.columns(2)
+        col1.plotly_chart(fig_na.figure, use_container_width=True, key="fl_na_col1")
+        col2.plotly_chart(fig_no.figure, use_container_width=True, key="fl_no_col2")
+        st.plotly_chart(fig_esp.figure, use_container_width=True, key="fl_esp_col3")
+    elif n_figs == 2:
+        col1, col2 = st.columns(2)
+        col1.plotly_chart(figuras[0].figure, use_container_width=True, key="fl_fig1")
+        col2.plotly_chart(figuras[1].figure, use_container_width=True, key="fl_fig2")
+    elif n_figs == 1:
+        st.plotly_chart(figuras[0].figure, use_container_width=True, key="fl_single")
+
+    # Botão de download (dados completos)
+    if figuras:
+        btn_download_multiple(figuras)
+
+    # --------- ÁREA DE DADOS BRUTOS E DOWNLOAD EXCEL ---------
+    st.write("---")
+    st.write("### Dados Brutos - Fase Livre")
+    
+    # Mostrar dataframe filtrado (só a página visível vai para o navegador)
+    paginated_table(df_fl, key="tabela_fl", version=(workbook_merger.version, data_inicio, data_fim, tuple(poço_selecionado)))
+    
+    # Botão para download em Excel
+    btn_download_excel(df_fl, "dados_fase_livre.xlsx")
+
+
+@_painel
+def _painel_produto(df_volume_produto, data_inicio, data_fim, freq, acumulado_global):
+    st.write("## Gráficos de Volume Produto")
+
+    # Recorte da janela de datas feito dentro do painel (só reexecuta com ele)
+    df_volume_produto = filter_by_date(df_volume_produto, 'Data', data_inicio, data_fim)
+
+    # -------- Valor Acumulado --------
+    # Calculado uma vez por versão dos dados; a janela é só um recorte do acumulado
+    colunas_produto = ['Volume Removido SAO (L)', 'Volume Removido Bailer (L)']
+    produto_acumulado = _derivado("produto_acumulado", lambda: CumulativeVolume(workbook_merger.frame("Volume Produto"), colunas_produto, 'Data'))
+    df_volume_produto = fillna_columns(df_volume_produto, colunas_produto, 0)
+    df_volume_produto['Volume Acumulado (L)'] = produto_acumulado.window(data_inicio, data_fim, restart=not acumulado_global)
+
+    # ---------------------- Cards -----------------------
+    kpis = _kpis("produto", lambda: volume_kpis(df_volume_produto, colunas_produto, 'Data', produto_acumulado, data_inicio, data_fim, restart=not acumulado_global))
+    volume_acumulado_atual = kpis["cumulative"]
+    volume_produto_atual_removido_sao = kpis["latest"]['Volume Removido SAO (L)']
+    volume_acumulado_atual_removido_bailer = kpis["latest"]['Volume Removido Bailer (L)']
+    dias_sem_registro = days_since(kpis["last_date"])
+    # KPIs
+    k1, k2, k3, k4 = st.columns(4)
+    with k1: card("Volume Removido SAO Atual", 0 if pd.isna(volume_produto_atual_removido_sao) else f"{volume_produto_atual_removido_sao:.2f}", "💧", color="#0571ED")
+    with k2: card("Volume Removido Bailer Atual", 0 if pd.isna(volume_acumulado_atual_removido_bailer) else f"{volume_acumulado_atual_removido_bailer:.2f}", "📦", color="#DD7D23")
+    with k3: card("Volume Acumulado Atual ", 0 if pd.isna(volume_acumulado_atual) else f"{volume_acumulado_atual:.2f}", "✅", color="#2EE43D")
+    with k4: card("Dias Sem Registro", "-" if dias_sem_registro is None else dias_sem_registro, "🛑", color="#D7263D")
+
+    # ---------------------- Gráficos -----------------------
+    # Soma por período (períodos sem registro = 0) e acumulado no fechamento de cada período
+    produto_rollup = _derivado("produto_rollup", lambda: DailyRollup(workbook_merger.frame("Volume Produto"), colunas_produto, 'Data'))
+    df_produto_grafico = volume_chart_frame(produto_rollup, produto_acumulado, data_inicio, data_fim, freq, restart=not acumulado_global)
+
+    # Initialize session state for produto columns
+    if "filtro_colunas_produto" not in st.session_state:
+        st.session_state["filtro_colunas_produto"] = []
+    
+    col1, col2 = st.columns([3, 1],vertical_alignment="center")
+    colunas_escolher = col1.multiselect("Selecione as colunas para o gráfico", options=['Volume Removido SAO (L)', 'Volume Removido Bailer (L)', 'Volume Acumulado (L)'], default=st.session_state["filtro_colunas_produto"] if st.session_state["filtro_colunas_produto"] else ['Volume Removido SAO (L)'], key="filtro_colunas_produto")
+    if not colunas_escolher:
+        st.warning("Por favor, selecione pelo menos uma coluna.")
+        return
+    col2.button("Limpar", key="btn_limpar_colunas_prod", on_click=_clear_state_key, kwargs={"key": "filtro_colunas_produto"})
+
+    figuras = []
+
+    if colunas_escolher:
+        if 'Volume Acumulado (L)' in colunas_escolher:
+            zoom = _faixa_zoom("vol_acumulado")
+            fig_vol_ac = _figura(("produto_acumulado", data_inicio, data_fim, freq, acumulado_global, zoom), lambda: fig_acumulado(df_produto_grafico, zoom))
+            figuras.append(fig_vol_ac)
+
+        if 'Volume Removido SAO (L)' in colunas_escolher:
+            fig_vol_sao = _figura(("produto_barras", 'Volume Removido SAO (L)', data_inicio, data_fim, freq), lambda: fig_volume_barras(df_produto_grafico, 'Volume Removido SAO (L)'))
+            figuras.append(fig_vol_sao)
+
+        if 'Volume Removido Bailer (L)' in colunas_escolher:
+            fig_vol_bailer = _figura(("produto_barras", 'Volume Removido Bailer (L)', data_inicio, data_fim, freq), lambda: fig_volume_barras(df_produto_grafico, 'Volume Removido Bailer (L)'))
+            figuras.append(fig_vol_bailer)
+        
+        # Exibir gráficos
+        n_figs = len(figuras)
+        if n_figs == 3:
+            col1, col2, col3 = st.columns(3)
+            col1.plotly_chart(fig_vol_ac.figure, use_container_width=True, key="vol_acumulado", on_select=functools.partial(_guardar_zoom, "vol_acumulado"), selection_mode="box")
+            col2.plotly_chart(fig_vol_sao.figure, use_container_width=True, key="vol_sao")
+            col3.plotly_chart(fig_vol_bailer.figure, use_container_width=True, key="vol_bailer")
+            
+        elif len(colunas_escolher) == 2:
+            col1, col2 = st.columns(2)
+            if 'Volume Acumulado (L)' in colunas_escolher and 'Volume Removido SAO (L)' in colunas_escolher:
+                col1.plotly_chart(fig_vol_ac.figure, use_container_width=True, key="vol_acumulado", on_select=functools.partial(_guardar_zoom, "vol_acumulado"), selection_mode="box")
+                col2.plotly_chart(fig_vol_sao.figure, use_container_width=True, key="vol_sao")
+            elif 'Volume Acumulado (L)' in colunas_escolher and 'Volume Removido Bailer (L)' in colunas_escolher:
+                col1.plotly_chart(fig_vol_ac.figure, use_container_width=True, key="vol_acumulado", on_select=functools.partial(_guardar_zoom, "vol_acumulado"), selection_mode="box")
+                col2.plotly_chart(fig_vol_bailer.figure, use_container_width=True, key="vol_bailer")
+            else:
+                col1.plotly_chart(fig_vol_sao.figure, use_container_width=True, key="vol_sao")
+                col2.plotly_chart(fig_vol_bailer.figure, use_container_width=True, key="vol_bailer")
+        else:
+            if 'Volume Acumulado (L)' in colunas_escolher:
+                st.plotly_chart(fig_vol_ac.figure, use_container_width=True, key="vol_acumulado", on_select=functools.partial(_guardar_zoom, "vol_acumulado"), selection_mode="box")
+            elif 'Volume Removido SAO (L)' in colunas_escolher:
+                st.plotly_chart(fig_vol_sao.figure, use_container_width=True, key="vol_sao")
+            else:
+                st.plotly_chart(fig_vol_bailer.figure, use_container_width=True, key="vol_bailer")
+
+        if 'Volume Acumulado (L)' in colunas_escolher:
+            _botao_zoom("vol_acumulado")
+
+        if figuras:
+            btn_download_multiple(figuras)
+
+    # --------- ÁREA DE DADOS BRUTOS E DOWNLOAD EXCEL ---------
+    st.write("---")
+    st.write("### Dados Brutos - Volume Produto")
+    
+    # Mostrar dataframe filtrado (só a página visível vai para o navegador)
+    paginated_table(df_volume_produto, key="tabela_produto", version=(workbook_merger.version, data_inicio, data_fim, acumulado_global))
+    
+    # Botão para download em Excel
+    btn_download_excel(df_volume_produto, "dados_volume_produto.xlsx")
+
+
+@_painel
+def _painel_bombeado(df_volume, data_inicio, data_fim, freq, acumulado_global):
+    st.write("## Gráficos de Volume Bombeado")
+
+    # Recorte da janela de datas feito dentro do painel (só reexecuta com ele)
+    df_volume = filter_by_date(df_volume, 'Data', data_inicio, data_fim)
+
+    # -------- Valor Acumulado --------
+    # Calculado uma vez por versão dos dados; a janela é só um recorte do acumulado
+    bombeado_acumulado = _derivado("bombeado_acumulado", lambda: CumulativeVolume(workbook_merger.frame("Volume Bombeado"), ['Volume Bombeado (L)'], 'Data'))
+    df_volume = fillna_columns(df_volume, ['Volume Bombeado (L)'], 0)
+    df_volume['Volume Acumulado (L)'] = bombeado_acumulado.window(data_inicio, data_fim, restart=not acumulado_global)
+    
+    # ---------------------- Cards -----------------------
+    kpis = _kpis("bombeado", lambda: volume_kpis(df_volume, ['Volume Bombeado (L)'], 'Data', bombeado_acumulado, data_inicio, data_fim, restart=not acumulado_global, well_col='Poço'))
+    volume_bombeado_atual = kpis["latest"]['Volume Bombeado (L)']
+    volume_acumulado_atual = kpis["cumulative"]
+    dias_sem_registro = days_since(kpis["last_date"])
+
+    # KPIs
+    k1, k2, k3, k4 = st.columns(4)
+    with k1: card("Volume Bombeado Atual", 0 if pd.isna(volume_bombeado_atual) else f"{volume_bombeado_atual:.2f}", "💧", color="#0571ED")
+    with k2: card("Nº de Poços em Operação ", kpis["active_wells"], "✅", color="#2EE43D")
+    with k3: card("Volume Acumulado Atual", 0 if pd.isna(volume_acumulado_atual) else f"{volume_acumulado_atual:.2f}", "📦", color="#DD7D23")
+    with k4: card("Dias Sem Registro", "-" if dias_sem_registro is None else dias_sem_registro, "🛑", color="#D7263D")
+
+    # ---------------------- Gráficos -----------------------
+    # Soma de todos os poços por período e acumulado no fechamento de cada período
+    bombeado_rollup = _derivado("bombeado_rollup", lambda: DailyRollup(workbook_merger.frame("Volume Bombeado"), ['Volume Bombeado (L)'], 'Data'))
+    df_bombeado_grafico = volume_chart_frame(bombeado_rollup, bombeado_acumulado, data_inicio, data_fim, freq, restart=not acumulado_global)
+
+    # Initialize session state for bombeado columns
+    if "filtro_colunas_bombeado" not in st.session_state:
+        st.session_state["filtro_colunas_bombeado"] = []
+    
+    col1, col2 = st.columns([3, 1],vertical_alignment="center")
+    colunas_escolher = col1.multiselect("Selecione as colunas para o gráfico", options=['Volume Acumulado (L)', 'Volume Bombeado (L)'], default=st.session_state["filtro_colunas_bombeado"] if st.session_state["filtro_colunas_bombeado"] else ['Volume Acumulado (L)'], key="filtro_colunas_bombeado")
+    if not colunas_escolher:
+        st.warning("Por favor, selecione pelo menos uma coluna.")
+        return
+    col2.button("Limpar", key="btn_limpar_colunas_bomb", on_click=_clear_state_key, kwargs={"key": "filtro_colunas_bombeado"})
+    
+    figuras = []
+
+    if colunas_escolher:
+        if 'Volume Acumulado (L)' in colunas_escolher:
+            zoom = _faixa_zoom("vol_acumulado_bomb")
+            fig_vol_ac = _figura(("bombeado_acumulado", data_inicio, data_fim, freq, acumulado_global, zoom), lambda: fig_acumulado(df_bombeado_grafico, zoom))
+            figuras.append(fig_vol_ac)
+
+        if 'Volume Bombeado (L)' in colunas_escolher:
+            fig_vol_bom = _figura(("bombeado_barras", data_inicio, data_fim, freq), lambda: fig_volume_barras(df_bombeado_grafico, 'Volume Bombeado (L)'))
+            figuras.append(fig_vol_bom)
+
+        n_figs = len(figuras)
+        if n_figs == 2:
+            col1, col2 = st.columns(2)
+            col1.plotly_chart(fig_vol_ac.figure, use_container_width=True, key="vol_acumulado_bomb", on_select=functools.partial(_guardar_zoom, "vol_acumulado_bomb"), selection_mode="box")
+            col2.plotly_chart(fig_vol_bom.figure, use_container_width=True, key="vol_bombeado")
+        else:
+            if 'Volume Acumulado (L)' in colunas_escolher:
+                st.plotly_chart(fig_vol_ac.figure, use_container_width=True, key="vol_acumulado_bomb", on_select=functools.partial(_guardar_zoom, "vol_acumulado_bomb"), selection_mode="box")
+            else:
+                st.plotly_chart(fig_vol_bom.figure, use_container_width=True, key="vol_bombeado")
+
+        if 'Volume Acumulado (L)' in colunas_escolher:
+            _botao_zoom("vol_acumulado_bomb")
+
+        if figuras:
+            btn_download_multiple(figuras)
+
+    # --------- ÁREA DE DADOS BRUTOS E DOWNLOAD EXCEL ---------
+    st.write("---")
+    st.write("### Dados Brutos - Volume Bombeado")
+    
+    # Mostrar dataframe filtrado (só a página visível vai para o navegador)
+    paginated_table(df_volume, key="tabela_bombeado", version=(workbook_merger.version, data_inicio, data_fim, acumulado_global))
+    
+    # Botão para download em Excel
+    btn_download_excel(df_volume, "dados_volume_bombeado.xlsx")
+
+
 if df_fl is not None and df_volume_produto is not None and df_volume is not None:
     # ARMAZENAR OS VALORES ORIGINAIS ANTES DE QUALQUER FILTRAGEM
     data_min_original = pd.to_datetime(df_volume['Data'].min())
@@ -156,300 +555,41 @@ if df_fl is not None and df_volume_produto is not None and df_volume is not None
         format="DD/MM/YYYY"
     )
 
-    # Filtrar DataFrame pelo intervalo de datas selecionado
-    df_volume = filter_by_date(df_volume, 'Data', data_inicio, data_fim)
-    df_fl = filter_by_date(df_fl, 'Data', data_inicio, data_fim)
-    df_volume_produto = filter_by_date(df_volume_produto, 'Data', data_inicio, data_fim)
-
-
-    if tipo_grafico == "FL":
-        st.write("## Gráficos de Fase Livre")
-
-        # Preencher NaN
-        df_fl = fillna_columns(df_fl, ['NA (m)', 'NO (m)', 'Esp. (m)'], 0)
-
-        # Filtros de Poços
-        filtroCol1, filtroCol2 = st.columns(2)
-        pocos = df_fl['Poço'].unique().tolist()
-
-        if "filtro_pocos" not in st.session_state:
-            st.session_state["filtro_pocos"] = [pocos[0]]
-
-        pocos_col1, pocos_col2 = filtroCol1.columns([3,1], vertical_alignment="center")
-        poço_selecionado = pocos_col1.multiselect(
-            "Selecione os Poços",
-            options=pocos,
-            default=st.session_state["filtro_pocos"] if st.session_state["filtro_pocos"] else [pocos[0]],
-            key="filtro_pocos"
-        )
-        pocos_col2.button("Limpar", key="btn_limpar_pocos", on_click=_clear_state_key, kwargs={"key":"filtro_pocos"})
-
-        if poço_selecionado:
-            df_fl = df_fl[df_fl['Poço'].isin(poço_selecionado)]
-        else:
-            st.warning("Por favor, selecione pelo menos um poço.")
-            st.stop()
-
-        # Filtros de Tipo
-        tipo = ['NA (m)','NO (m)','Esp. (m)']
-        if "filtro_tipos" not in st.session_state:
-            st.session_state["filtro_tipos"] = [tipo[0]]
-
-        tipos_col1, tipos_col2 = filtroCol2.columns([3,1], vertical_alignment="center")
-        tipo_selecionado = tipos_col1.multiselect(
-            "Selecione o Tipo",
-            options=tipo,
-            default=st.session_state["filtro_tipos"] if st.session_state["filtro_tipos"] else [tipo[0]],
-            key="filtro_tipos"
+    # ----- Granularidade -----
+    # Os gráficos são agregados no servidor antes de serem montados
+    st.sidebar.write("### Granularidade")
+    granularidade = st.sidebar.selectbox(
+        "Agrupar por",
+        options=["Diário", "Semanal", "Mensal", "Anual"],
+        index=0,
+        key="granularidade"
+    )
+    freq = granularity_to_freq(granularidade)
+    # Volume acumulado: reinicia no início do período filtrado ou soma desde o primeiro registro
+    acumulado_global = st.sidebar.checkbox("Acumulado desde o primeiro registro", value=False, key="acumulado_global")
+
+    # ----- Exportação -----
+    # Os três conjuntos filtrados em um único arquivo, montados apenas no clique
+    st.sidebar.write("### Exportar Dados Filtrados")
+    with st.sidebar:
+        btn_download_datasets(
+            lambda fl=df_fl, produto=df_volume_produto, bombeado=df_volume: {
+                "FL": filter_by_date(fl, 'Data', data_inicio, data_fim),
+                "Volume Produto": filter_by_date(produto, 'Data', data_inicio, data_fim),
+                "Volume Bombeado": filter_by_date(bombeado, 'Data', data_inicio, data_fim),
+            },
+            file_name="dados_filtrados"
         )
-        if not tipo_selecionado:
-            st.warning("Por favor, selecione pelo menos um tipo.")
-            st.stop()
-        tipos_col2.button("Limpar", key="btn_limpar_tipos", on_click=_clear_state_key, kwargs={"key":"filtro_tipos"})
-
-        # Criar figuras
-        figuras = []
-
-        if 'NA (m)' in tipo_selecionado:
-            fig_na = px.bar(
-                df_fl,
-                x='Data',
-                y='NA (m)',
-                color='Poço',
-                title='Nível de Água (NA)',
-                color_discrete_sequence=px.colors.qualitative.Dark24,
-                barmode='group'
-            )
-            fig_na.update_layout(dragmode='zoom', xaxis_tickangle=-45, legend_title_text='Poços')
-            figuras.append(fig_na)
-
-        if 'NO (m)' in tipo_selecionado:
-            fig_no = px.bar(
-                df_fl,
-                x='Data',
-                y='NO (m)',
-                color='Poço',
-                title='Nível de Óleo (NO)',
-                color_discrete_sequence=px.colors.qualitative.Dark24,
-                barmode='group'
-            )
-            fig_no.update_layout(dragmode='zoom', xaxis_tickangle=-45, legend_title_text='Poços')
-            figuras.append(fig_no)
-
-        if 'Esp. (m)' in tipo_selecionado:
-            fig_esp = px.bar(
-                df_fl,
-                x='Data',
-                y='Esp. (m)',
-                color='Poço',
-                title='Espessura de Óleo',
-                color_discrete_sequence=px.colors.qualitative.Dark24,
-                barmode='group'
-            )
-            fig_esp.update_layout(dragmode='zoom', xaxis_tickangle=-45, legend_title_text='Poços')
-            figuras.append(fig_esp)
-
-        # Exibir gráficos
-        n_figs = len(figuras)
-        if n_figs == 3:
-            col1, col2 = st.columns(2)
-            col1.plotly_chart(fig_na, use_container_width=True, key="fl_na_col1")
-            col2.plotly_chart(fig_no, use_container_width=True, key="fl_no_col2")
-            st.plotly_chart(fig_esp, use_container_width=True, key="fl_esp_col3")
-        elif n_figs == 2:
-            col1, col2 = st.columns(2)
-            col1.plotly_chart(figuras[0], use_container_width=True, key="fl_fig1")
-            col2.plotly_chart(figuras[1], use_container_width=True, key="fl_fig2")
-        elif n_figs == 1:
-            st.plotly_chart(figuras[0], use_container_width=True, key="fl_single")
-
-        # Botão de download (dados completos)
-        if figuras:
-            btn_download_multiple(figuras)
-
-        # --------- ÁREA DE DADOS BRUTOS E DOWNLOAD EXCEL ---------
-        st.write("---")
-        st.write("### Dados Brutos - Fase Livre")
-        
-        # Mostrar dataframe filtrado
-        st.dataframe(df_fl, use_container_width=True)
-        
-        # Botão para download em Excel
-        btn_download_excel(df_fl, "dados_fase_livre.xlsx")
 
 
+    if tipo_grafico == "FL":
+        _painel_fl(df_fl, data_inicio, data_fim, freq)
 
     elif tipo_grafico == "Volume Produto":
-        st.write("## Gráficos de Volume Produto")
-
-        # -------- Valor Acumulado --------
-        df_volume_produto = fillna_columns(df_volume_produto, ['Volume Removido SAO (L)', 'Volume Removido Bailer (L)'], 0)
-        df_volume_produto = add_accumulated_column(df_volume_produto, ['Volume Removido SAO (L)', 'Volume Removido Bailer (L)'], 'Volume Acumulado (L)')
-
-        # ---------------------- Cards -----------------------
-        volume_acumulado_atual = df_volume_produto.sort_values(by='Data', ascending=False).iloc[0]['Volume Acumulado (L)']
-        volume_produto_atual_removido_sao = df_volume_produto.sort_values(by='Data', ascending=False).iloc[0]['Volume Removido SAO (L)']
-        volume_acumulado_atual_removido_bailer = df_volume_produto.sort_values(by='Data', ascending=False).iloc[0]['Volume Removido Bailer (L)']
-        dias_sem_registro = (pd.to_datetime("today") - pd.to_datetime(df_volume_produto['Data'].max())).days
-        # KPIs
-        k1, k2, k3, k4 = st.columns(4)
-        with k1: card("Volume Removido SAO Atual", 0 if pd.isna(volume_produto_atual_removido_sao) else f"{volume_produto_atual_removido_sao:.2f}", "💧", color="#0571ED")
-        with k2: card("Volume Removido Bailer Atual", 0 if pd.isna(volume_acumulado_atual_removido_bailer) else f"{volume_acumulado_atual_removido_bailer:.2f}", "📦", color="#DD7D23")
-        with k3: card("Volume Acumulado Atual ", 0 if pd.isna(volume_acumulado_atual) else f"{volume_acumulado_atual:.2f}", "✅", color="#2EE43D")
-        with k4: card("Dias Sem Registro", dias_sem_registro, "🛑", color="#D7263D")
-
-        # ---------------------- Gráficos -----------------------
-        # Initialize session state for produto columns
-        if "filtro_colunas_produto" not in st.session_state:
-            st.session_state["filtro_colunas_produto"] = []
-        
-        col1, col2 = st.columns([3, 1],vertical_alignment="center")
-        colunas_escolher = col1.multiselect("Selecione as colunas para o gráfico", options=['Volume Removido SAO (L)', 'Volume Removido Bailer (L)', 'Volume Acumulado (L)'], default=st.session_state["filtro_colunas_produto"] if st.session_state["filtro_colunas_produto"] else ['Volume Removido SAO (L)'], key="filtro_colunas_produto")
-        if not colunas_escolher:
-            st.warning("Por favor, selecione pelo menos uma coluna.")
-            st.stop()
-        col2.button("Limpar", key="btn_limpar_colunas_prod", on_click=_clear_state_key, kwargs={"key": "filtro_colunas_produto"})
-
-        figuras = []
-
-        if colunas_escolher:
-            if 'Volume Acumulado (L)' in colunas_escolher:
-                fig_vol_ac = px.line(df_volume_produto, x='Data', y='Volume Acumulado (L)' ,title='Volume Acumulado ao Longo do Tempo', color_discrete_sequence=['#c44d15'])
-                figuras.append(fig_vol_ac)
-
-            if 'Volume Removido SAO (L)' in colunas_escolher:
-                fig_vol_sao = px.bar(
-                    df_volume_produto,
-                    x='Data',
-                    y='Volume Removido SAO (L)',
-                    title='Volume Removido SAO ao Longo do Tempo',
-                    color_discrete_sequence=['#156082']
-                )
-                figuras.append(fig_vol_sao)
-
-            if 'Volume Removido Bailer (L)' in colunas_escolher:
-                fig_vol_bailer = px.bar(
-                    df_volume_produto,
-                    x='Data',
-                    y='Volume Removido Bailer (L)',
-                    title='Volume Removido Bailer ao Longo do Tempo',
-                    color_discrete_sequence=['#e17b7b']
-                )
-                figuras.append(fig_vol_bailer)
-            
-            # Exibir gráficos
-            n_figs = len(figuras)
-            if n_figs == 3:
-                col1, col2, col3 = st.columns(3)
-                col1.plotly_chart(fig_vol_ac, use_container_width=True, key="vol_acumulado")
-                col2.plotly_chart(fig_vol_sao, use_container_width=True, key="vol_sao")
-                col3.plotly_chart(fig_vol_bailer, use_container_width=True, key="vol_bailer")
-                
-            elif len(colunas_escolher) == 2:
-                col1, col2 = st.columns(2)
-                if 'Volume Acumulado (L)' in colunas_escolher and 'Volume Removido SAO (L)' in colunas_escolher:
-                    col1.plotly_chart(fig_vol_ac, use_container_width=True, key="vol_acumulado")
-                    col2.plotly_chart(fig_vol_sao, use_container_width=True, key="vol_sao")
-                elif 'Volume Acumulado (L)' in colunas_escolher and 'Volume Removido Bailer (L)' in colunas_escolher:
-                    col1.plotly_chart(fig_vol_ac, use_container_width=True, key="vol_acumulado")
-                    col2.plotly_chart(fig_vol_bailer, use_container_width=True, key="vol_bailer")
-                else:
-                    col1.plotly_chart(fig_vol_sao, use_container_width=True, key="vol_sao")
-                    col2.plotly_chart(fig_vol_bailer, use_container_width=True, key="vol_bailer")
-            else:
-                if 'Volume Acumulado (L)' in colunas_escolher:
-                    st.plotly_chart(fig_vol_ac, use_container_width=True, key="vol_acumulado")
-                elif 'Volume Removido SAO (L)' in colunas_escolher:
-                    st.plotly_chart(fig_vol_sao, use_container_width=True, key="vol_sao")
-                else:
-                    st.plotly_chart(fig_vol_bailer, use_container_width=True, key="vol_bailer")
-
-            if figuras:
-                btn_download_multiple(figuras)
-
-        # --------- ÁREA DE DADOS BRUTOS E DOWNLOAD EXCEL ---------
-        st.write("---")
-        st.write("### Dados Brutos - Volume Produto")
-        
-        # Mostrar dataframe filtrado
-        st.dataframe(df_volume_produto, use_container_width=True)
-        
-        # Botão para download em Excel
-        btn_download_excel(df_volume_produto, "dados_volume_produto.xlsx")
-                
-
+        _painel_produto(df_volume_produto, data_inicio, data_fim, freq, acumulado_global)
 
     elif tipo_grafico == "Volume Bombeado":
-        st.write("## Gráficos de Volume Bombeado")
-
-        # -------- Valor Acumulado --------
-        df_volume = fillna_columns(df_volume, ['Volume Bombeado (L)'], 0)
-        df_volume = add_accumulated_column(df_volume, ['Volume Bombeado (L)'], 'Volume Acumulado (L)')
-        
-        # ---------------------- Cards -----------------------
-        volume_bombeado_atual = df_volume.sort_values(by='Data', ascending=False).iloc[0]['Volume Bombeado (L)']
-        volume_acumulado_atual = df_volume.sort_values(by='Data', ascending=False).iloc[0]['Volume Acumulado (L)']
-        dias_sem_registro = (pd.to_datetime("today") - pd.to_datetime(df_volume['Data'].max())).days
-
-        # KPIs
-        k1, k2, k3, k4 = st.columns(4)
-        with k1: card("Volume Bombeado Atual", 0 if pd.isna(volume_bombeado_atual) else f"{volume_bombeado_atual:.2f}", "💧", color="#0571ED")
-        with k2: card("Nº de Poços em Operação ", 5, "✅", color="#2EE43D")
-        with k3: card("Volume Acumulado Atual", 0 if pd.isna(volume_acumulado_atual) else f"{volume_acumulado_atual:.2f}", "📦", color="#DD7D23")
-        with k4: card("Dias Sem Registro", dias_sem_registro, "🛑", color="#D7263D")
-
-        # ---------------------- Gráficos -----------------------
-        # Initialize session state for bombeado columns
-        if "filtro_colunas_bombeado" not in st.session_state:
-            st.session_state["filtro_colunas_bombeado"] = []
-        
-        col1, col2 = st.columns([3, 1],vertical_alignment="center")
-        colunas_escolher = col1.multiselect("Selecione as colunas para o gráfico", options=['Volume Acumulado (L)', 'Volume Bombeado (L)'], default=st.session_state["filtro_colunas_bombeado"] if st.session_state["filtro_colunas_bombeado"] else ['Volume Acumulado (L)'], key="filtro_colunas_bombeado")
-        if not colunas_escolher:
-            st.warning("Por favor, selecione pelo menos uma coluna.")
-            st.stop()
-        col2.button("Limpar", key="btn_limpar_colunas_bomb", on_click=_clear_state_key, kwargs={"key": "filtro_colunas_bombeado"})
-        
-        figuras = []
-
-        if colunas_escolher:
-            if 'Volume Acumulado (L)' in colunas_escolher:
-                fig_vol_ac = px.line(df_volume, x='Data', y='Volume Acumulado (L)' ,title='Volume Acumulado ao Longo do Tempo', color_discrete_sequence=['#c44d15'])
-                figuras.append(fig_vol_ac)
-
-            if 'Volume Bombeado (L)' in colunas_escolher:
-                fig_vol_bom = px.bar(
-                    df_volume,
-                    x='Data',
-                    y='Volume Bombeado (L)',
-                    title='Volume Bombeado ao Longo do Tempo',
-                    color_discrete_sequence=['#156082']
-                )
-                figuras.append(fig_vol_bom)
-
-            n_figs = len(figuras)
-            if n_figs == 2:
-                col1, col2 = st.columns(2)
-                col1.plotly_chart(fig_vol_ac, use_container_width=True, key="vol_acumulado_bomb")
-                col2.plotly_chart(fig_vol_bom, use_container_width=True, key="vol_bombeado")
-            else:
-                if 'Volume Acumulado (L)' in colunas_escolher:
-                    st.plotly_chart(fig_vol_ac, use_container_width=True, key="vol_acumulado_bomb")
-                else:
-                    st.plotly_chart(fig_vol_bom, use_container_width=True, key="vol_bombeado")
-
-            if figuras:
-                btn_download_multiple(figuras)
-
-        # --------- ÁREA DE DADOS BRUTOS E DOWNLOAD EXCEL ---------
-        st.write("---")
-        st.write("### Dados Brutos - Volume Bombeado")
-        
-        # Mostrar dataframe filtrado
-        st.dataframe(df_volume, use_container_width=True)
-        
-        # Botão para download em Excel
-        btn_download_excel(df_volume, "dados_volume_bombeado.xlsx")
+        _painel_bombeado(df_volume, data_inicio, data_fim, freq, acumulado_global)
 
     else:
-        st.warning("Por favor, selecione pelo menos uma coluna para o gráfico.")
\ No newline at end of file
+        st.warning("Por favor, selecione pelo menos uma coluna para o gráfico.")
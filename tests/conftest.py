@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# O app roda a partir da raiz do repositório; o gerador de planilhas fica em benchmarks/
+for path in (ROOT, os.path.join(ROOT, "benchmarks")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+@pytest.fixture(scope="session")
+def frames():
+    """Abas de uma planilha sintética lidas por parse_workbook, como no upload."""
+    from utils.ingest import parse_workbook
+    from workbook_generator import make_workbook
+
+    return parse_workbook(make_workbook(wells=6, years=1.5, seed=3, presence=0.7))
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cumulative import CumulativeVolume
+from utils.date_filters import clamp_date_range, full_period_index
+
+COLS = ["Volume Removido SAO (L)", "Volume Removido Bailer (L)"]
+WINDOWS = [(None, None), ("2018-02-10", "2018-11-03"), ("2018-05-01", "2018-05-01"), ("2010-01-01", "2010-12-31"), ("2030-01-01", "2030-02-01")]
+
+
+def _daily_total(df):
+    return df[COLS].fillna(0).sum(axis=1)
+
+
+@pytest.mark.parametrize("start,end", WINDOWS)
+@pytest.mark.parametrize("restart", [True, False])
+def test_window_matches_cumsum(frames, start, end, restart):
+    df = frames["Volume Produto"]
+    cumulative = CumulativeVolume(df, COLS)
+    got = cumulative.window(start, end, restart=restart)
+
+    total = _daily_total(df)
+    expected = total.cumsum()
+    window = clamp_date_range(df, "Data", start, end) if start is not None else df
+    expected = expected.loc[window.index]
+    if restart and len(window):
+        expected = expected - expected.iloc[0] + total.loc[window.index[0]]
+    pd.testing.assert_series_equal(got, expected, check_names=False, check_index_type=False)
+    assert cumulative.value(start, end, restart=restart) == pytest.approx(expected.iloc[-1] if len(expected) else (0.0 if restart else cumulative.before(start)))
+
+
+def test_before_and_at(frames):
+    df = frames["Volume Produto"]
+    cumulative = CumulativeVolume(df, COLS)
+    total = _daily_total(df)
+    dia = pd.Timestamp("2018-06-15")
+    assert cumulative.before(dia) == pytest.approx(total[df["Data"] < dia].sum())
+    assert cumulative.at(dia) == pytest.approx(total[df["Data"] <= dia].sum())
+    assert cumulative.total == pytest.approx(total.sum())
+    assert cumulative.offset(dia, restart=True) == 0.0
+
+
+@pytest.mark.parametrize("freq", ["D", "W-MON", "MS"])
+@pytest.mark.parametrize("restart", [True, False])
+def test_periods_close_each_period(frames, freq, restart):
+    df = frames["Volume Produto"]
+    start, end = pd.Timestamp("2018-02-10"), pd.Timestamp("2018-09-20")
+    periods = full_period_index(start, end, freq)
+    got = CumulativeVolume(df, COLS).periods(periods, start, end, restart=restart)
+
+    total = _daily_total(df)
+    closes = list(periods[1:] - pd.Timedelta(days=1)) + [end]
+    inicio = start if restart else df["Data"].min()
+    expected = [total[(df["Data"] >= inicio) & (df["Data"] <= min(c, end))].sum() for c in closes]
+    np.testing.assert_allclose(got, expected)
+
+
+def test_unsorted_input_and_missing_values():
+    df = pd.DataFrame({
+        "Data": pd.to_datetime(["2024-01-03", "2024-01-01", "2024-01-02", None]),
+        "Volume Removido SAO (L)": [3.0, 1.0, np.nan, 100.0],
+    })
+    cumulative = CumulativeVolume(df, ["Volume Removido SAO (L)", "Ausente"])
+    assert cumulative.window().tolist() == [1.0, 1.0, 4.0]
+    assert cumulative.total == 4.0
@@ -0,0 +1,64 @@
+import io
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.btn.data_export import export_datasets, open_export
+
+
+@pytest.fixture
+def fl():
+    """Aba FL com uma linha sem Poço (pd.NA na categoria) e uma medição vazia."""
+    return pd.DataFrame({
+        "Data": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+        "Poço": pd.Series(["PM-01", None, "PM-02"], dtype="string").astype("category"),
+        "NA (m)": [2.386, np.nan, 79.65],
+    })
+
+
+def test_excel_writes_missing_values_as_empty_cells(fl):
+    data = export_datasets({"FL": fl}, "excel")
+    back = pd.read_excel(io.BytesIO(data), sheet_name="FL")
+    assert back["Poço"].isna().tolist() == [False, True, False]
+    assert back["NA (m)"].isna().tolist() == [False, True, False]
+    assert back.loc[0, "NA (m)"] == 2.386
+    assert back["Data"].tolist() == fl["Data"].tolist()
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_zip_formats_round_trip(fl, fmt):
+    with zipfile.ZipFile(io.BytesIO(export_datasets({"FL": fl}, fmt))) as zf:
+        raw = zf.read(f"FL.{fmt}")
+    if fmt == "csv":
+        back = pd.read_csv(io.BytesIO(raw), encoding="utf-8-sig", parse_dates=["Data"])
+    else:
+        back = pd.read_parquet(io.BytesIO(raw))
+    assert len(back) == len(fl)
+    assert back["Poço"].isna().tolist() == [False, True, False]
+    np.testing.assert_array_equal(back["NA (m)"].to_numpy(dtype=float), fl["NA (m)"].to_numpy())
+
+
+def test_open_export_returns_readable_file(fl):
+    with open_export({"FL": fl}, "excel") as f:
+        assert f.read(2) == b"PK"
+
+
+@pytest.mark.parametrize("fmt", ["excel", "csv", "parquet"])
+def test_workbook_round_trip_in_small_chunks(frames, tmp_path, fmt):
+    from components.btn.data_export import WRITERS
+
+    path = tmp_path / "export"
+    WRITERS[fmt](frames, str(path), chunk_rows=97)
+    for sheet, df in frames.items():
+        if fmt == "excel":
+            back = pd.read_excel(path, sheet_name=sheet)
+        else:
+            with zipfile.ZipFile(path) as zf:
+                raw = io.BytesIO(zf.read(f"{sheet}.{fmt}"))
+            back = pd.read_csv(raw, encoding="utf-8-sig") if fmt == "csv" else pd.read_parquet(raw)
+        assert list(back.columns) == list(df.columns)
+        assert len(back) == len(df)
+        for col in df.select_dtypes("number").columns:
+            np.testing.assert_allclose(back[col].to_numpy(dtype=float), df[col].to_numpy(dtype=float), rtol=1e-6, equal_nan=True)
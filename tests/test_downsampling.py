@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.downsampling import downsample, lttb, minmax
+
+
+def _lttb_reference(x, y, n_out):
+    """LTTB ponto a ponto, como no artigo original (buckets de tamanho igual)."""
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    out, a = [0], 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        if i + 1 < n_out - 2:
+            nlo, nhi = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+            ax, ay = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        else:
+            ax, ay = x[-1], y[-1]
+        best, best_area = lo, -1.0
+        for k in range(lo, hi):
+            area = abs((x[a] - ax) * (y[k] - y[a]) - (x[a] - x[k]) * (ay - y[a]))
+            if area > best_area:
+                best, best_area = k, area
+        out.append(best)
+        a = best
+    return np.array(out + [n - 1])
+
+
+@pytest.mark.parametrize("n,n_out", [(1000, 100), (997, 50), (120, 7)])
+def test_lttb_matches_reference(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.random(n)) * 100
+    y = np.cumsum(rng.normal(size=n))
+    got = lttb(x, y, n_out)
+    np.testing.assert_array_equal(got, _lttb_reference(x, y, n_out))
+    assert len(got) == n_out and np.all(np.diff(got) > 0)
+
+
+def test_minmax_keeps_bucket_extremes():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=1000)
+    y[437] = 50.0
+    y[812] = -50.0
+    got = minmax(np.arange(1000), y, 100)
+    assert {0, 999, 437, 812} <= set(got.tolist())
+    assert len(got) <= 102 and np.all(np.diff(got) > 0)
+    buckets = (np.arange(1000) * 50) // 1000
+    for b in range(50):
+        idx = np.flatnonzero(buckets == b)
+        assert idx[np.argmax(y[idx])] in got and idx[np.argmin(y[idx])] in got
+
+
+def test_small_inputs_are_returned_whole():
+    np.testing.assert_array_equal(lttb([0, 1, 2], [1, 2, 3], 10), [0, 1, 2])
+    np.testing.assert_array_equal(minmax([0, 1, 2], [1, 2, 3], 10), [0, 1, 2])
+
+
+def test_downsample_window_and_missing_values():
+    df = pd.DataFrame({"Data": pd.date_range("2024-01-01", periods=500, freq="D"), "y": np.arange(500, dtype=float)})
+    df.loc[df.index % 10 == 0, "y"] = np.nan
+    zoom = downsample(df, "Data", "y", 1200, x_range=("2024-02-01", "2024-02-29"))
+    assert zoom["Data"].min() >= pd.Timestamp("2024-02-01") and zoom["Data"].max() <= pd.Timestamp("2024-02-29")
+    assert zoom["y"].notna().all() and len(zoom) == 27
+    small = downsample(df, "Data", "y", 40, method="minmax")
+    assert len(small) <= 42 and small["y"].max() == df["y"].max()
+    assert downsample(df.iloc[0:0], "Data", "y", 10).empty
+    with pytest.raises(ValueError):
+        downsample(df, "Data", "y", 10, method="media")
@@ -0,0 +1,34 @@
+import json
+
+import plotly.graph_objects as go
+
+from utils.figure_cache import FigureCache
+
+
+def _fig(n):
+    return go.Figure(go.Scatter(x=list(range(n)), y=[i * 0.5 for i in range(n)], name=f"s{n}"))
+
+
+def test_hit_rebuilds_the_same_figure_from_the_spec():
+    cache = FigureCache()
+    built = []
+    first = cache.get_or_build(("fl", 1), lambda: built.append(1) or _fig(10))
+    second = cache.get_or_build(("fl", 1), lambda: built.append(1) or _fig(10))
+    assert built == [1]
+    assert second.spec == first.spec and second.key_hash == first.key_hash
+    assert json.loads(second.figure.to_json()) == json.loads(first.figure.to_json())
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_only_specs_count_and_are_kept():
+    size = len(_fig(200).to_json())
+    cache = FigureCache(max_bytes=int(size * 2.5))
+    for i in range(4):
+        cache.get_or_build(("fig", i), lambda: _fig(200))
+    assert len(cache) == 2
+    assert cache.nbytes == 2 * size <= cache.max_bytes
+    assert cache.stats()["evictions"] == 2
+    assert all(entry._figure is None for entry in cache._entries.values())
+    # Maior que o limite: devolvida, mas não guardada
+    assert cache.get_or_build(("grande",), lambda: _fig(2000)).figure is not None
+    assert len(cache) == 2
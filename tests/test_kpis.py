@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cumulative import CumulativeVolume
+from utils.date_filters import clamp_date_range
+from utils.kpis import days_since, latest_position, volume_kpis
+
+COL = "Volume Bombeado (L)"
+
+
+@pytest.mark.parametrize("start,end", [("2018-01-01", "2019-06-30"), ("2018-03-01", "2018-08-31"), ("2010-01-01", "2010-12-31")])
+@pytest.mark.parametrize("restart", [True, False])
+def test_volume_kpis_match_pandas(frames, start, end, restart):
+    df = frames["Volume Bombeado"]
+    window = clamp_date_range(df, "Data", start, end)
+    got = volume_kpis(window, [COL], "Data", CumulativeVolume(df, [COL]), start, end, restart=restart, well_col="Poço", active_days=30)
+
+    if len(window):
+        last_date = window["Data"].max()
+        assert got["last_date"] == last_date
+        np.testing.assert_equal(got["latest"][COL], window.loc[window["Data"] == last_date, COL].iloc[-1])
+        recent = window[(window["Data"] > last_date - pd.Timedelta(days=30)) & (window[COL] > 0)]
+        assert got["active_wells"] == recent["Poço"].nunique()
+    else:
+        assert got["last_date"] is None and got["active_wells"] == 0
+        assert np.isnan(got["latest"][COL])
+    inicio = start if restart else df["Data"].min()
+    esperado = df.loc[(df["Data"] >= inicio) & (df["Data"] <= end), COL].fillna(0).sum()
+    assert got["cumulative"] == pytest.approx(esperado)
+
+
+def test_without_cumulative_sums_the_window():
+    df = pd.DataFrame({
+        "Data": pd.to_datetime(["2024-01-02", "2024-01-05", "2024-01-05", None]),
+        "Poço": pd.Series(["PM-01", "PM-02", None, "PM-03"], dtype="string").astype("category"),
+        COL: [10.0, np.nan, 5.0, 7.0],
+    })
+    got = volume_kpis(df, [COL, "Ausente"], well_col="Poço")
+    assert got["last_date"] == pd.Timestamp("2024-01-05")
+    assert got["latest"] == {COL: 5.0}
+    assert got["cumulative"] == 22.0
+    # A linha sem Poço tem volume, mas não conta como poço ativo
+    assert got["active_wells"] == 1
+
+
+def test_latest_position_and_days_since():
+    dates = np.array(["2024-01-02", "NaT", "2024-01-03", "2024-01-03", "2024-01-01"], dtype="datetime64[ns]")
+    assert latest_position(dates) == 3
+    assert latest_position(np.array(["NaT"], dtype="datetime64[ns]")) == -1
+    assert days_since(pd.Timestamp("2024-01-01"), today="2024-01-31") == 30
+    assert days_since(pd.NaT) is None and days_since(None) is None
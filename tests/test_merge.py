@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from utils.date_filters import sort_by_date
+from utils.merge import WorkbookMerger, merge_sources
+from workbook_generator import make_frames
+
+
+def _workbook(seed, start="2024-01-01"):
+    raw = make_frames(wells=3, years=0.2, seed=seed, start=start, blank_fraction=0)
+    frames = {}
+    for sheet, df in raw.items():
+        df = df.drop(columns=[c for c in df.columns if "Unnamed" in c])
+        if "Poço" in df.columns:
+            df["Poço"] = df["Poço"].astype("category")
+        frames[sheet] = sort_by_date(df, "Data")
+    return frames
+
+
+def _reference(frames_list, sheet, key):
+    """Concatena em ordem e descarta as linhas cuja chave já apareceu em uma planilha anterior."""
+    kept, seen = [], set()
+    for frames in frames_list:
+        df = frames[sheet]
+        keys = list(map(tuple, df[key or list(df.columns)].astype(str).to_numpy()))
+        mask = np.array([k not in seen for k in keys], dtype=bool)
+        seen.update(keys)
+        kept.append(df[mask])
+    out = pd.concat(kept, ignore_index=True)
+    return out.iloc[np.argsort(out["Data"].to_numpy(), kind="stable")].reset_index(drop=True)
+
+
+def test_overlapping_workbooks_are_deduplicated():
+    a = _workbook(1)
+    b = _workbook(2, start="2024-02-01")
+    # b repete parte de a; em Volume Produto só linhas idênticas contam como repetidas
+    b = {sheet: sort_by_date(pd.concat([b[sheet], a[sheet].iloc[:20]], ignore_index=True), "Data") for sheet in a}
+    merger = WorkbookMerger()
+    merger.add("a", a)
+    merger.add("b", b)
+    for sheet, key in [("FL", ["Data", "Poço"]), ("Volume Bombeado", ["Data", "Poço"]), ("Volume Produto", None)]:
+        got = merger.frame(sheet)
+        ref = _reference([a, b], sheet, key)
+        assert got["Data"].is_monotonic_increasing
+        pd.testing.assert_frame_equal(got.astype(str), ref.astype(str))
+    assert merger.duplicates >= 60
+
+
+def test_rows_sharing_only_a_date_are_kept():
+    a = {"Volume Produto": pd.DataFrame({"Data": pd.to_datetime(["2024-01-01"]), "Volume Removido SAO (L)": [1.0]})}
+    b = {"Volume Produto": pd.DataFrame({"Data": pd.to_datetime(["2024-01-01"]), "Volume Removido SAO (L)": [2.0]})}
+    merger = WorkbookMerger()
+    merger.add("a", a)
+    merger.add("b", b)
+    assert merger.frame("Volume Produto")["Volume Removido SAO (L)"].tolist() == [1.0, 2.0]
+
+
+def test_same_reading_with_other_dtypes_is_a_duplicate():
+    df = pd.DataFrame({"Data": pd.to_datetime(["2024-01-01"]), "Volume Removido SAO (L)": [1.5]})
+    other = df.astype({"Data": "datetime64[s]", "Volume Removido SAO (L)": "float32"})
+    merger = WorkbookMerger()
+    merger.add("a", {"Volume Produto": df})
+    merger.add("b", {"Volume Produto": other})
+    assert len(merger.frame("Volume Produto")) == 1
+    assert merger.duplicates == 1
+
+
+def test_sheet_without_key_columns_is_not_deduplicated():
+    df = pd.DataFrame({"Data": pd.to_datetime(["2024-01-01"]), "NA (m)": [1.0]})
+    merger = WorkbookMerger()
+    merger.add("a", {"FL": df})
+    merger.add("b", {"FL": df})
+    assert len(merger.frame("FL")) == 2
+
+
+def test_categories_are_restored_and_frame_is_incremental():
+    a = _workbook(1)
+    b = _workbook(2, start="2023-12-01")
+    b["FL"]["Poço"] = b["FL"]["Poço"].cat.rename_categories(lambda p: p.replace("PM", "PZ"))
+    merger = WorkbookMerger()
+    merger.add("a", a)
+    first = merger.frame("FL")
+    merger.add("b", b)
+    merged = merger.frame("FL")
+    assert isinstance(merged["Poço"].dtype, pd.CategoricalDtype)
+    assert set(merged["Poço"].cat.categories) == set(a["FL"]["Poço"].cat.categories) | set(b["FL"]["Poço"].cat.categories)
+    assert merged["Data"].is_monotonic_increasing
+    assert len(merged) == len(first) + len(b["FL"])
+
+
+def test_merge_sources_restarts_when_a_source_is_removed():
+    a, b = _workbook(1), _workbook(2, start="2024-03-01")
+    merger = merge_sources(None, [("a", lambda: a), ("b", lambda: b)])
+    assert merger.sources == ["a", "b"]
+    same = merge_sources(merger, [("a", lambda: a), ("b", lambda: b), ("c", lambda: a)])
+    assert same is merger and merger.sources == ["a", "b", "c"]
+    restarted = merge_sources(merger, [("b", lambda: b)])
+    assert restarted is not merger and restarted.sources == ["b"]
+    pd.testing.assert_frame_equal(restarted.frame("FL"), b["FL"].reset_index(drop=True))
@@ -0,0 +1,34 @@
+from streamlit.testing.v1 import AppTest
+
+
+def _app():
+    from components.profiling.panel import profiling_panel
+
+    class Perfil:
+        """Profiler de onde a memória residente não pode ser lida (mem_delta sempre None)."""
+        enabled = True
+
+        def last_complete_run(self):
+            return 1
+
+        def records(self, run):
+            return [{"stage": "ler", "seconds": 0.5, "rows_in": 10, "rows_out": 10, "mem_delta": None, "error": None}]
+
+        def summary(self):
+            return [{"stage": "ler", "n": 1, "p50": 0.5}]
+
+        def to_jsonl(self):
+            return ""
+
+        def clear(self):
+            pass
+
+    profiling_panel(Perfil(), caches={"Figuras": {"entries": 1, "bytes": 10}})
+
+
+def test_panel_without_memory_readings():
+    at = AppTest.from_function(_app).run()
+    assert not at.exception
+    assert len(at.sidebar.dataframe) == 3
+    mem = at.sidebar.dataframe[1].value["mem (MB)"]
+    assert mem.dtype == "float64" and mem.isna().all()
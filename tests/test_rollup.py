@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.date_filters import aggregate_full_period, clamp_date_range
+from utils.rollup import DailyRollup
+
+FL_TIPOS = ["NA (m)", "NO (m)", "Esp. (m)"]
+PRODUTO = ["Volume Removido SAO (L)", "Volume Removido Bailer (L)"]
+WINDOWS = [
+    ("2018-01-01", "2019-06-30"),
+    ("2018-02-10", "2018-11-03"),
+    ("2018-03-15", "2018-03-15"),
+    # Antes e depois dos dados: janela sem nenhum registro
+    ("2010-01-01", "2010-12-31"),
+    ("2030-01-01", "2030-03-01"),
+]
+FREQS = ["D", "W-MON", "MS", "YS"]
+
+
+def _reference(df, freq, how, start, end, group_keys=None):
+    """aggregate_full_period sobre a janela recortada: o oráculo do DailyRollup.query."""
+    window = clamp_date_range(df, "Data", start, end)
+    fill = 0 if any(a in ("sum", "count") for a in how.values()) else None
+    return aggregate_full_period(window, "Data", freq, how, start, end, group_keys, fill_value=fill)
+
+
+def _compare(got, ref, keys, cols):
+    got = got.set_index(keys)[cols].astype(float)
+    ref = ref.set_index(keys)[cols].astype(float)
+    # O rollup também traz os grupos sem registro na janela (zerados ou ausentes)
+    got = got.loc[got.index.isin(ref.index)] if len(ref) else got.iloc[:0]
+    assert sorted(got.index) == sorted(ref.index)
+    np.testing.assert_allclose(got.loc[ref.index].to_numpy(), ref.to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("start,end", WINDOWS)
+@pytest.mark.parametrize("freq", FREQS)
+def test_fl_mean_by_well(frames, freq, start, end):
+    fl = frames["FL"]
+    how = {t: "mean" for t in FL_TIPOS}
+    got = DailyRollup(fl, FL_TIPOS, "Data", "Poço").query(start, end, freq, how)
+    ref = _reference(fl, freq, how, start, end, ["Poço"])
+    ref["Poço"] = ref["Poço"].astype(object)
+    got["Poço"] = got["Poço"].astype(object)
+    _compare(got, ref, ["Poço", "Data"], FL_TIPOS)
+
+
+@pytest.mark.parametrize("start,end", WINDOWS)
+@pytest.mark.parametrize("freq", FREQS)
+@pytest.mark.parametrize("agg", ["sum", "count", "last"])
+def test_volume_totals(frames, freq, start, end, agg):
+    df = frames["Volume Produto"]
+    how = {c: agg for c in PRODUTO}
+    got = DailyRollup(df, PRODUTO, "Data").query(start, end, freq, how)
+    ref = _reference(df, freq, how, start, end)
+    _compare(got, ref, ["Data"], PRODUTO)
+
+
+def test_sum_pads_every_period(frames):
+    df = frames["Volume Bombeado"]
+    got = DailyRollup(df, ["Volume Bombeado (L)"], "Data", "Poço").query("2010-01-01", "2010-03-31", "MS", {"Volume Bombeado (L)": "sum"})
+    assert len(got) == 3 * df["Poço"].nunique()
+    assert (got["Volume Bombeado (L)"] == 0).all()
+
+
+def test_mean_leaves_out_empty_periods(frames):
+    rollup = DailyRollup(frames["FL"], FL_TIPOS, "Data", "Poço")
+    assert rollup.query("2010-01-01", "2010-03-31", "MS", {"NA (m)": "mean"}).empty
+
+
+def test_rows_without_well_are_ignored():
+    df = pd.DataFrame({
+        "Data": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02"]),
+        "Poço": pd.Series(["PM-01", None, "PM-01"], dtype="string").astype("category"),
+        "NA (m)": [1.0, 50.0, np.nan],
+    })
+    got = DailyRollup(df, ["NA (m)"], "Data", "Poço").query("2024-01-01", "2024-01-02", "D", {"NA (m)": "mean"})
+    assert got["Poço"].tolist() == ["PM-01"]
+    assert got["NA (m)"].tolist() == [1.0]
+
+
+def test_groups_filter(frames):
+    rollup = DailyRollup(frames["FL"], FL_TIPOS, "Data", "Poço")
+    got = rollup.query("2018-01-01", "2018-12-31", "MS", {"NA (m)": "mean"}, groups=["PM-02", "inexistente"])
+    assert set(got["Poço"]) == {"PM-02"}
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from utils.schema import SHEET_SCHEMAS, normalize_frame
+
+
+def test_readings_keep_full_precision():
+    df = pd.DataFrame({"Data": ["01/02/2024", "02/02/2024", ""], "NA (m)": [2.386, 79.65, np.nan], "NO (m)": ["153,27", "", "x"]})
+    out, report = normalize_frame(df, SHEET_SCHEMAS["FL"])
+    assert out["NA (m)"].dtype == np.float64
+    assert out["NA (m)"].iloc[0] == 2.386
+    assert out["NO (m)"].iloc[0] == 153.27
+    assert out["Data"].iloc[0] == pd.Timestamp("2024-02-01")
+    assert report["invalid"] == {"NO (m)": 1}
+
+
+def test_exact_values_are_downcast():
+    df = pd.DataFrame({"Volume Bombeado (L)": [1.5, 2.0, np.nan], "Outra": [0.25, 4.0, 8.0], "Texto": ["a", "b", "c"]})
+    out, _ = normalize_frame(df, SHEET_SCHEMAS["Volume Bombeado"])
+    assert out["Volume Bombeado (L)"].dtype == np.float32
+    assert out["Outra"].dtype == np.float32
+    np.testing.assert_array_equal(out["Volume Bombeado (L)"].to_numpy(dtype=float), df["Volume Bombeado (L)"].to_numpy())
+    # Colunas não declaradas com valores inexatos em float32 não mudam
+    inexata = pd.DataFrame({"Outra": [0.1, 0.2]})
+    assert normalize_frame(inexata)[0]["Outra"].dtype == np.float64
+
+
+def test_input_frame_is_not_modified():
+    df = pd.DataFrame({"Data": ["01/02/2024"], "Poço": [" PM-01 "], "NA (m)": ["2,5"]})
+    before = df.copy()
+    out, _ = normalize_frame(df, SHEET_SCHEMAS["FL"])
+    pd.testing.assert_frame_equal(df, before)
+    assert out["Poço"].iloc[0] == "PM-01"
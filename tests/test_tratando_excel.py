@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from utils.tratando_excel import add_accumulated_column, fillna_columns, tratando_df
+
+
+def test_helpers_do_not_modify_their_input():
+    df = pd.DataFrame({
+        "Data": pd.to_datetime(["2024-01-03", "2024-01-01", None, "2024-01-02"]),
+        "Volume (L)": [3.0, 1.0, 5.0, np.nan],
+        "Unnamed: 2": ["x", None, None, None],
+    })
+    before = df.copy()
+
+    tratado = tratando_df(df)
+    assert list(tratado.columns) == ["Data", "Volume (L)"]
+    assert len(tratado) == 3
+
+    preenchido = fillna_columns(tratado, ["Volume (L)", "Ausente"])
+    assert preenchido["Volume (L)"].tolist() == [3.0, 1.0, 0.0]
+    assert tratado["Volume (L)"].isna().sum() == 1
+
+    acumulado = add_accumulated_column(preenchido, ["Volume (L)"], "Acumulado (L)")
+    # Acumulado em ordem de data, não na ordem das linhas
+    assert acumulado["Acumulado (L)"].tolist() == [4.0, 1.0, 1.0]
+    assert "Acumulado (L)" not in preenchido.columns
+
+    pd.testing.assert_frame_equal(df, before)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.well_index import WellIndex
+
+WINDOWS = [(None, None), ("2018-02-10", "2018-11-03"), ("2018-05-01", "2018-05-01"), ("2010-01-01", "2010-12-31")]
+
+
+@pytest.mark.parametrize("start,end", WINDOWS)
+@pytest.mark.parametrize("wells", [["PM-03"], ["PM-05", "PM-01"], ["PM-02", "inexistente"], []])
+def test_select_matches_boolean_filter(frames, start, end, wells):
+    fl = frames["FL"]
+    got = WellIndex(fl).select(wells, start, end)
+
+    mask = pd.Series(True, index=fl.index)
+    if start is not None:
+        mask &= (fl["Data"] >= start) & (fl["Data"] <= end)
+    parts = [fl[mask & (fl["Poço"] == w)] for w in wells]
+    expected = pd.concat(parts) if parts else fl.iloc[0:0]
+    assert got["Poço"].astype(object).tolist() == expected["Poço"].astype(object).tolist()
+    np.testing.assert_array_equal(got["Data"].to_numpy(), expected["Data"].to_numpy())
+    np.testing.assert_array_equal(got["NA (m)"].to_numpy(), expected["NA (m)"].to_numpy())
+
+
+def test_rows_without_well_are_left_out():
+    df = pd.DataFrame({
+        "Data": pd.to_datetime(["2024-01-02", "2024-01-01", "2024-01-03"]),
+        "Poço": pd.Series(["PM-01", None, "PM-01"], dtype="string").astype("category"),
+        "NA (m)": [2.0, 9.0, 3.0],
+    })
+    index = WellIndex(df)
+    assert index.wells == ["PM-01"]
+    assert index.select(["PM-01"])["NA (m)"].tolist() == [2.0, 3.0]
+    assert index.partition("PM-01", "2024-01-03", "2024-01-31")["NA (m)"].tolist() == [3.0]
@@ -1,22 +1,77 @@
-from .tratando_excel import tratando_df, fillna_columns, add_accumulated_column, filter_by_date
-from .date_filters import (
-	ensure_datetime,
-	clamp_date_range,
-	granularity_to_freq,
-	aggregate_by_period,
-	add_cumulative,
-	full_period_index,
-)
+"""
+Utilitários de leitura, filtro e agregação dos dados do dashboard.
 
-__all__ = [
-	'tratando_df',
-	'fillna_columns',
-	'add_accumulated_column',
-	'filter_by_date',  # kept for backward compatibility
-	'ensure_datetime',
-	'clamp_date_range',
-	'granularity_to_freq',
-	'aggregate_by_period',
-	'add_cumulative',
-	'full_period_index',
-]
+Os nomes abaixo são importados do submódulo apenas no primeiro acesso
+(PEP 562), para que páginas que usam só utils.auth não carreguem pandas,
+numpy e pyarrow no início.
+"""
+import importlib
+
+# Nome exportado -> submódulo que o define
+_EXPORTS = {
+	'tratando_df': 'tratando_excel',
+	'fillna_columns': 'tratando_excel',
+	'add_accumulated_column': 'tratando_excel',
+	'filter_by_date': 'tratando_excel',  # kept for backward compatibility
+	'ensure_datetime': 'date_filters',
+	'sort_by_date': 'date_filters',
+	'date_bounds': 'date_filters',
+	'date_slice': 'date_filters',
+	'clamp_date_range': 'date_filters',
+	'granularity_to_freq': 'date_filters',
+	'period_start': 'date_filters',
+	'aggregate_by_period': 'date_filters',
+	'add_cumulative': 'date_filters',
+	'full_period_index': 'date_filters',
+	'aggregate_full_period': 'date_filters',
+	'SharedDatasetCache': 'shared_cache',
+	'DatasetLease': 'shared_cache',
+	'get_shared_cache': 'shared_cache',
+	'readonly_view': 'shared_cache',
+	'content_hash': 'workbook_cache',
+	'read_sheets': 'excel_reader',
+	'available_engine': 'excel_reader',
+	'SHEET_COLUMNS': 'excel_reader',
+	'SHEET_DTYPES': 'excel_reader',
+	'DataStore': 'data_store',
+	'SHEETS': 'ingest',
+	'parse_workbook': 'ingest',
+	'load_workbook': 'ingest',
+	'load_stored': 'ingest',
+	'WorkbookMerger': 'merge',
+	'merge_sources': 'merge',
+	'WellIndex': 'well_index',
+	'DailyRollup': 'rollup',
+	'CumulativeVolume': 'cumulative',
+	'volume_kpis': 'kpis',
+	'latest_position': 'kpis',
+	'days_since': 'kpis',
+	'lttb': 'downsampling',
+	'minmax': 'downsampling',
+	'downsample': 'downsampling',
+	'FigureCache': 'figure_cache',
+	'CachedFigure': 'figure_cache',
+	'SHEET_SCHEMAS': 'schema',
+	'normalize_frame': 'schema',
+	'normalize_frames': 'schema',
+	'memory_report': 'schema',
+	'StageProfiler': 'profiling',
+	'activate': 'profiling',
+	'stage': 'profiling',
+	'timed': 'profiling',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+	module = _EXPORTS.get(name)
+	if module is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	value = getattr(importlib.import_module(f".{module}", __name__), name)
+	globals()[name] = value
+	return value
+
+
+def __dir__():
+	return sorted(set(globals()) | set(__all__))
@@ -14,6 +14,15 @@ def verify_credentials(username: str, password: str) -> bool:
     )
 
 
+# Usuários que veem os painéis de diagnóstico (cache, desempenho)
+ADMIN_USERS = {"admin"}
+
+
+def is_admin() -> bool:
+    """True se o usuário autenticado é administrador."""
+    return require_authentication() and st.session_state.get("username") in ADMIN_USERS
+
+
 def require_authentication() -> bool:
     """Retorna True se autenticado, caso contrário False."""
     return bool(st.session_state.get("authenticated", False))
@@ -0,0 +1,92 @@
+from typing import Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .date_filters import sort_by_date
+
+
+class CumulativeVolume:
+    """
+    Running total of the row-wise sum of some columns, computed once on the
+    date-sorted frame.
+
+    The totals are kept as a prefix array (cum[0] = 0, cum[i] = sum of the
+    first i rows), so for any date window:
+
+    - the global accumulation is a slice of the array;
+    - an accumulation that restarts at the window start is the same slice
+      minus the prefix value at the start (one subtraction, no re-cumsum).
+
+    Window bounds are found by binary search on the sorted dates.
+    """
+
+    def __init__(self, df: pd.DataFrame, value_cols: Iterable[str], date_col: str = "Data"):
+        self.date_col = date_col
+        self.value_cols: List[str] = [c for c in value_cols if c in df.columns]
+        df = sort_by_date(df, date_col)
+        self.index = df.index
+        self._dates = df[date_col].to_numpy(dtype="datetime64[ns]")
+        values = np.zeros(len(df))
+        for col in self.value_cols:
+            values += np.nan_to_num(pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan))
+        self._cum = np.zeros(len(df) + 1)
+        np.cumsum(values, out=self._cum[1:])
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._cum.nbytes + self._dates.nbytes)
+
+    @property
+    def total(self) -> float:
+        return float(self._cum[-1])
+
+    def bounds(self, start=None, end=None) -> Tuple[int, int]:
+        """Row positions [i, j) of the inclusive date window (same rule as date_bounds)."""
+        i = 0 if start is None else int(np.searchsorted(self._dates, pd.to_datetime(start).to_datetime64(), side="left"))
+        j = len(self._dates) if end is None else int(np.searchsorted(self._dates, pd.to_datetime(end).to_datetime64(), side="right"))
+        return i, max(i, j)
+
+    def before(self, start) -> float:
+        """Total accumulated strictly before start."""
+        return float(self._cum[self.bounds(start)[0]])
+
+    def at(self, end) -> float:
+        """Total accumulated up to and including end."""
+        return float(self._cum[self.bounds(None, end)[1]])
+
+    def value(self, start=None, end=None, restart: bool = True) -> float:
+        """Running total at the last row of [start, end]."""
+        i, j = self.bounds(start, end)
+        return float(self._cum[j] - (self._cum[i] if restart else 0.0))
+
+    def offset(self, start, restart: bool = True) -> float:
+        """Value to add to sums that start at `start` (0 when the window restarts)."""
+        return 0.0 if restart else self.before(start)
+
+    def window(self, start=None, end=None, restart: bool = True) -> pd.Series:
+        """
+        Running total for the rows of [start, end], indexed like the source
+        frame so it can be assigned to a date_slice of it.
+        """
+        i, j = self.bounds(start, end)
+        values = self._cum[i + 1:j + 1]
+        if restart:
+            values = values - self._cum[i]
+        return pd.Series(values, index=self.index[i:j])
+
+    def periods(self, periods: pd.DatetimeIndex, start, end, restart: bool = True) -> np.ndarray:
+        """
+        Running total at the close of each period of an aggregated frame
+        (periods as returned by full_period_index), clipped to [start, end].
+        """
+        i, j = self.bounds(start, end)
+        closes = np.searchsorted(self._dates, pd.DatetimeIndex(periods)[1:].to_numpy(), side="left")
+        closes = np.clip(np.append(closes, j), i, j)
+        values = self._cum[closes]
+        if restart:
+            values = values - self._cum[i]
+        return values
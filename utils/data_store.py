@@ -0,0 +1,113 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import unicodedata
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+META_FILE = "meta.json"
+
+
+def _sheet_file(sheet: str) -> str:
+    """File name (Arrow IPC/Feather) used for a sheet."""
+    ascii_name = unicodedata.normalize("NFKD", sheet).encode("ascii", "ignore").decode()
+    slug = re.sub(r"[^0-9A-Za-z]+", "_", ascii_name).strip("_").lower() or "sheet"
+    return f"{slug}.arrow"
+
+
+class DataStore:
+    """
+    On-disk columnar store of ingested workbooks.
+
+    Each dataset lives in DATA_DIR/<dataset_id>/ with one uncompressed Arrow
+    IPC (Feather v2) file per sheet plus a meta.json describing it. Files are
+    uncompressed so that they can be memory-mapped and read without copying
+    numeric buffers.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, dataset_id: str) -> str:
+        return os.path.join(self.root, dataset_id)
+
+    def exists(self, dataset_id: str) -> bool:
+        return os.path.isfile(os.path.join(self.path(dataset_id), META_FILE))
+
+    def save(
+        self,
+        dataset_id: str,
+        frames: Dict[str, pd.DataFrame],
+        name: Optional[str] = None,
+        report: Optional[dict] = None,
+    ) -> None:
+        """
+        Persist frames under dataset_id. The directory is written to a temporary
+        location first and renamed, so readers never see a partial dataset.
+        """
+        if self.exists(dataset_id):
+            return
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        tmp = tempfile.mkdtemp(prefix=f".{dataset_id[:12]}-", dir=self.root)
+        try:
+            sheets = {}
+            for sheet, df in frames.items():
+                file_name = _sheet_file(sheet)
+                table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+                feather.write_feather(table, os.path.join(tmp, file_name), compression="uncompressed")
+                sheets[sheet] = {"file": file_name, "rows": len(df)}
+            meta = {
+                "id": dataset_id,
+                "name": name or dataset_id[:12],
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "sheets": sheets,
+            }
+            if report:
+                # Células inválidas e memória por aba medidas na ingestão (utils.schema)
+                meta["report"] = report
+            with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path(dataset_id))
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            # Another session may have saved the same dataset concurrently.
+            if not self.exists(dataset_id):
+                raise
+
+    def meta(self, dataset_id: str) -> dict:
+        with open(os.path.join(self.path(dataset_id), META_FILE), encoding="utf-8") as f:
+            return json.load(f)
+
+    def load(self, dataset_id: str) -> Dict[str, pd.DataFrame]:
+        """Reopen every sheet of a stored dataset through a memory map."""
+        import pyarrow.feather as feather
+
+        meta = self.meta(dataset_id)
+        base = self.path(dataset_id)
+        frames = {}
+        for sheet, info in meta["sheets"].items():
+            table = feather.read_table(os.path.join(base, info["file"]), memory_map=True)
+            frames[sheet] = table.to_pandas(split_blocks=True)
+        return frames
+
+    def list_datasets(self) -> List[dict]:
+        """Metadata of every stored dataset, most recent first."""
+        datasets = []
+        for entry in os.listdir(self.root):
+            if entry.startswith(".") or not self.exists(entry):
+                continue
+            try:
+                datasets.append(self.meta(entry))
+            except (OSError, ValueError):
+                continue
+        return sorted(datasets, key=lambda m: m.get("created", ""), reverse=True)
+
+    def delete(self, dataset_id: str) -> None:
+        shutil.rmtree(self.path(dataset_id), ignore_errors=True)
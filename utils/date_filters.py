@@ -1,5 +1,5 @@
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 def ensure_datetime(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
@@ -10,25 +10,62 @@ def ensure_datetime(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
     return df
 
 
+def sort_by_date(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
+    """
+    Return df with date_col as datetime, rows without a valid date removed and
+    rows ordered by date (stable, so ties keep their original order).
+    Already sorted frames are returned as is.
+    """
+    df = ensure_datetime(df, date_col)
+    dates = df[date_col]
+    if dates.hasnans:
+        df = df.loc[dates.notna()]
+        dates = df[date_col]
+    if not dates.is_monotonic_increasing:
+        df = df.sort_values(date_col, kind="mergesort")
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        df = df.reset_index(drop=True)
+    return df
+
+
+def date_bounds(df: pd.DataFrame, date_col: str, start, end) -> Tuple[int, int]:
+    """
+    Positional bounds [i, j) of the rows of a date-sorted frame that fall in the
+    inclusive [start, end] range, found by binary search (O(log n)).
+    """
+    dates = df[date_col]
+    i = 0 if start is None else int(dates.searchsorted(pd.to_datetime(start), side="left"))
+    j = len(df) if end is None else int(dates.searchsorted(pd.to_datetime(end), side="right"))
+    return i, max(i, j)
+
+
+def date_slice(df: pd.DataFrame, date_col: str, start, end) -> pd.DataFrame:
+    """
+    Inclusive [start, end] range of a frame already sorted by date_col
+    (see sort_by_date). Returns a positional slice, so no data is copied.
+    """
+    i, j = date_bounds(df, date_col, start, end)
+    return df.iloc[i:j]
+
+
 def clamp_date_range(
     df: pd.DataFrame, date_col: str, start, end
 ) -> pd.DataFrame:
     """
     Filter by inclusive [start, end] date range safely.
     Accepts datetime/date/str for start/end.
+
+    Frames kept sorted at ingestion are sliced directly; anything else is
+    sorted first (see sort_by_date).
     """
-    df = ensure_datetime(df, date_col)
-    if start is not None:
-        start = pd.to_datetime(start)
-    if end is not None:
-        # Make end inclusive up to the end of the day
-        end = pd.to_datetime(end)
-    mask = True
-    if start is not None:
-        mask = mask & (df[date_col] >= start)
-    if end is not None:
-        mask = mask & (df[date_col] <= end)
-    return df.loc[mask]
+    dates = df[date_col]
+    if not (
+        pd.api.types.is_datetime64_any_dtype(dates)
+        and not dates.hasnans
+        and dates.is_monotonic_increasing
+    ):
+        df = sort_by_date(df, date_col)
+    return date_slice(df, date_col, start, end)
 
 
 def granularity_to_freq(granularity: str) -> str:
@@ -46,6 +83,19 @@ def granularity_to_freq(granularity: str) -> str:
     return "D"
 
 
+# Period aliases whose start_time matches the labels used by aggregate_by_period
+_PERIOD_ALIASES = {"D": "D", "W-MON": "W-SUN", "MS": "M", "YS": "Y"}
+
+
+def period_start(ts, freq: str) -> pd.Timestamp:
+    """Start (label) of the period of the given frequency that contains ts."""
+    ts = pd.to_datetime(ts)
+    alias = _PERIOD_ALIASES.get(freq)
+    if alias is None:
+        return ts.normalize()
+    return ts.to_period(alias).start_time
+
+
 def aggregate_by_period(
     df: pd.DataFrame,
     date_col: str,
@@ -65,10 +115,13 @@ def aggregate_by_period(
     if group_keys is None:
         group_keys = []
     df = ensure_datetime(df, date_col)
-    # Build grouping keys
-    grouper = [pd.Grouper(key=date_col, freq=freq)]
+    # Build grouping keys (weekly bins start on Monday and are labelled by it)
+    if freq.startswith("W-"):
+        grouper = [pd.Grouper(key=date_col, freq=freq, closed="left", label="left")]
+    else:
+        grouper = [pd.Grouper(key=date_col, freq=freq)]
     group_cols = group_keys + grouper
-    grouped = df.groupby(group_cols, dropna=False).agg(agg_map).reset_index()
+    grouped = df.groupby(group_cols, dropna=False, observed=True).agg(agg_map).reset_index()
     # Optional: sort for better plotting/cumsum
     grouped = grouped.sort_values(group_keys + [date_col])
     return grouped
@@ -79,21 +132,28 @@ def add_cumulative(
 ) -> pd.DataFrame:
     """
     Add a cumulative sum column from a list of columns summed row-wise, ordered by date.
+    For repeated date windows over the same data see CumulativeVolume.
     """
     df = df.copy()
     df[value_cols] = df[value_cols].fillna(0)
     df[new_col] = df[value_cols].sum(axis=1)
-    df = df.sort_values(date_col)
+    if not df[date_col].is_monotonic_increasing:
+        df = df.sort_values(date_col, kind="stable")
     df[new_col] = df[new_col].cumsum()
     return df
 
 
+# Agregações em que um período sem registro tem valor (0); as demais ficam sem linha
+PADDED_AGGREGATIONS = ("sum", "count")
+
+
 def full_period_index(start, end, freq: str) -> pd.DatetimeIndex:
     """
     Build a continuous DatetimeIndex between start and end inclusive with the given frequency.
     Ensures we cover the entire selected range for plotting/aggregation continuity.
     """
-    s = pd.to_datetime(start)
+    # Align the start to its period label so the first (partial) period is kept
+    s = period_start(start, freq)
     e = pd.to_datetime(end)
     # Ensure end is inclusive; for freq-based ranges, date_range includes end if aligned
     idx = pd.date_range(s, e, freq=freq)
@@ -101,3 +161,47 @@ def full_period_index(start, end, freq: str) -> pd.DatetimeIndex:
     if len(idx) == 0:
         idx = pd.DatetimeIndex([s, e])
     return idx
+
+
+def aggregate_full_period(
+    df: pd.DataFrame,
+    date_col: str,
+    freq: str,
+    agg_map: Dict[str, str],
+    start,
+    end,
+    group_keys: Optional[List[str]] = None,
+    fill_value=None,
+) -> pd.DataFrame:
+    """
+    aggregate_by_period followed by a reindex on full_period_index(start, end),
+    so every group has one row per period of the window. Periods without data
+    get fill_value (NaN when None).
+
+    Only sum/count aggregations are padded: with just mean/last there is no
+    value for an empty period, so those rows are left out instead of being
+    sent to the charts as NaN.
+
+    The views query utils.rollup.DailyRollup instead; this pandas version is
+    kept as its reference implementation, and tests/test_rollup.py checks
+    DailyRollup.query against it.
+    """
+    if group_keys is None:
+        group_keys = []
+    grouped = aggregate_by_period(df, date_col, freq, agg_map, group_keys)
+    periods = full_period_index(start, end, freq)
+    periods.name = date_col
+    if not any(agg in PADDED_AGGREGATIONS for agg in agg_map.values()):
+        cols = list(agg_map)
+        keep = grouped[date_col].isin(periods) & grouped[cols].notna().any(axis=1)
+        return grouped.loc[keep].reset_index(drop=True)
+    if group_keys:
+        groups = grouped[group_keys].drop_duplicates()
+        full = groups.merge(periods.to_frame(index=False), how="cross")
+    else:
+        full = periods.to_frame(index=False)
+    result = full.merge(grouped, on=group_keys + [date_col], how="left")
+    if fill_value is not None:
+        cols = list(agg_map)
+        result[cols] = result[cols].fillna(fill_value)
+    return result
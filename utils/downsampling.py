@@ -0,0 +1,103 @@
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+METHODS = ("lttb", "minmax")
+
+
+def _as_float(x) -> np.ndarray:
+    """x axis as float64 (datetimes become int64 nanoseconds)."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb(x, y, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of n_out points that preserve the
+    visual shape of the (x, y) series. The first and last points are always
+    kept; inside each bucket the point forming the largest triangle with the
+    previously selected point and the average of the next bucket is chosen.
+    """
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Average point of every bucket, computed at once with cumulative sums
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    sizes = np.maximum(edges[1:] - edges[:-1], 1)
+    avg_x = (cx[edges[1:]] - cx[edges[:-1]]) / sizes
+    avg_y = (cy[edges[1:]] - cy[edges[:-1]]) / sizes
+    avg_x = np.append(avg_x, x[-1])
+    avg_y = np.append(avg_y, y[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax(x, y, n_out: int) -> np.ndarray:
+    """
+    Indices of the minimum and maximum of each of n_out // 2 equal-count
+    buckets (plus the first and last points), in x order. Keeps every peak.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+    bucket = (np.arange(n) * n_buckets) // n
+    # Ordena por (balde, y); o primeiro de cada balde é o mínimo, o último o máximo
+    order = np.lexsort((y, bucket))
+    sorted_bucket = bucket[order]
+    first = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]])
+    last = np.r_[first[1:] - 1, n - 1]
+    keep = np.concatenate([[0, n - 1], order[first], order[last]])
+    return np.unique(keep)
+
+
+def downsample(
+    df: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    n_out: int,
+    method: str = "lttb",
+    x_range: Optional[Sequence] = None,
+) -> pd.DataFrame:
+    """
+    Reduce df (sorted by x_col) to about n_out rows for plotting y_col.
+
+    - method: 'lttb' (shape-preserving) or 'minmax' (keeps every extreme)
+    - x_range: optional (x0, x1) window; rows outside it are dropped first, so
+      a zoomed-in range is served at full resolution when it is small enough.
+
+    Rows with a missing y are ignored. Returns a positional subset of df.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method {method!r}")
+    if x_range is not None:
+        x0, x1 = x_range
+        xs = df[x_col]
+        if pd.api.types.is_datetime64_any_dtype(xs):
+            x0, x1 = pd.to_datetime(x0), pd.to_datetime(x1)
+        df = df.iloc[int(xs.searchsorted(x0, side="left")):int(xs.searchsorted(x1, side="right"))]
+    df = df.loc[df[y_col].notna()]
+    if len(df) <= n_out:
+        return df
+    fn = lttb if method == "lttb" else minmax
+    idx = fn(df[x_col].to_numpy(), df[y_col].to_numpy(), n_out)
+    return df.iloc[idx]
@@ -0,0 +1,94 @@
+import importlib.util
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .profiling import timed
+
+# Colunas usadas por cada visão do dashboard. None = todas as colunas nomeadas.
+SHEET_COLUMNS: Dict[str, Optional[List[str]]] = {
+    "Volume Bombeado": ["Data", "Poço", "Volume Bombeado (L)"],
+    "Volume Produto": ["Data", "Volume Removido SAO (L)", "Volume Removido Bailer (L)"],
+    "FL": ["Data", "Poço", "NA (m)", "NO (m)", "Esp. (m)"],
+    "Hidrômetros": None,
+}
+
+# Tipos declarados na leitura; colunas ausentes na planilha são ignoradas.
+# Colunas numéricas não são forçadas aqui: células com texto derrubariam a
+# leitura. Elas são convertidas (e as inválidas contadas) por utils.schema.
+SHEET_DTYPES: Dict[str, Dict[str, str]] = {
+    "Volume Bombeado": {"Poço": "string"},
+    "Volume Produto": {},
+    "FL": {"Poço": "string"},
+    "Hidrômetros": {},
+}
+
+# Engines tried in order when none is requested explicitly.
+FAST_ENGINES = ["calamine"]
+_ENGINE_MODULES = {"calamine": "python_calamine", "openpyxl": "openpyxl"}
+
+
+def available_engine(engine: Optional[str] = None) -> str:
+    """
+    Return the Excel engine to use.
+
+    An explicit engine is returned unchanged. Otherwise the first installed
+    engine from FAST_ENGINES is used, falling back to openpyxl.
+    """
+    if engine is not None:
+        return engine
+    for candidate in FAST_ENGINES:
+        if importlib.util.find_spec(_ENGINE_MODULES[candidate]) is not None:
+            return candidate
+    return "openpyxl"
+
+
+def _column_selector(columns: Optional[Iterable[str]]):
+    """Build a usecols callable that skips 'Unnamed' columns and unused ones."""
+    wanted = set(columns) if columns is not None else None
+
+    def select(col) -> bool:
+        col = str(col)
+        if "Unnamed" in col:
+            return False
+        return wanted is None or col in wanted
+
+    return select
+
+
+@timed("read_excel")
+def read_sheets(
+    source,
+    sheets: Optional[Iterable[str]] = None,
+    engine: Optional[str] = None,
+    columns: Optional[Dict[str, Optional[List[str]]]] = None,
+    dtypes: Optional[Dict[str, Dict[str, str]]] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Read several sheets from a workbook opened only once.
+
+    - source: path, bytes buffer or file-like object accepted by pd.ExcelFile
+    - sheets: sheet names to read (default: keys of SHEET_COLUMNS)
+    - engine: force an engine; by default the fastest installed one is used
+    - columns/dtypes: per-sheet column projection and declared dtypes
+      (default: SHEET_COLUMNS / SHEET_DTYPES)
+
+    With openpyxl the workbook is loaded in read-only mode, so rows are
+    streamed instead of building the full cell tree.
+    """
+    if sheets is None:
+        sheets = list(SHEET_COLUMNS)
+    if columns is None:
+        columns = SHEET_COLUMNS
+    if dtypes is None:
+        dtypes = SHEET_DTYPES
+
+    frames = {}
+    with pd.ExcelFile(source, engine=available_engine(engine)) as xl:
+        for sheet in sheets:
+            frames[sheet] = xl.parse(
+                sheet,
+                usecols=_column_selector(columns.get(sheet)),
+                dtype=dtypes.get(sheet) or None,
+            )
+    return frames
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class CachedFigure:
+    """
+    A figure kept as its serialized JSON spec.
+
+    The spec is produced once, when the figure is built, and reused by the
+    exporters (HTML report, PNG renderer, artifact hashes) instead of calling
+    fig.to_json() again. Only the spec is stored in the cache, so its size is
+    the whole memory cost of an entry: the entry returned by a miss still
+    carries the figure that was just built, and on a hit `figure` rebuilds it
+    from the spec.
+    """
+
+    __slots__ = ("spec", "key_hash", "_figure")
+
+    def __init__(self, spec: str, key_hash: str, figure: Any = None):
+        self.spec = spec
+        self.key_hash = key_hash
+        self._figure = figure
+
+    @property
+    def figure(self) -> Any:
+        if self._figure is not None:
+            return self._figure
+        import plotly.graph_objects as go
+        return go.Figure(json.loads(self.spec))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.spec)
+
+    def to_json(self) -> str:
+        return self.spec
+
+
+def key_digest(key: Hashable) -> str:
+    """Stable digest of a cache key (tuple of dataset version and filter state)."""
+    return hashlib.sha256(repr(key).encode()).hexdigest()
+
+
+class FigureCache:
+    """
+    LRU cache of figures bounded by the total size of their specs (the only
+    thing stored per entry).
+
+    Keys are tuples describing everything a figure depends on, e.g.
+    (chart id, dataset version, date range, wells/types/columns, granularity).
+    Entries are evicted least-recently-used first once max_bytes is exceeded;
+    a figure larger than max_bytes is returned but not kept.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedFigure]" = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> CachedFigure:
+        """Return the cached figure for key, calling build() only on a miss."""
+        digest = key_digest(key)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(digest)
+                return entry
+            self.misses += 1
+        figure = build()
+        entry = CachedFigure(figure.to_json(), digest, figure)
+        with self._lock:
+            if entry.nbytes <= self.max_bytes and digest not in self._entries:
+                self._entries[digest] = CachedFigure(entry.spec, digest)
+                self._nbytes += entry.nbytes
+                while self._nbytes > self.max_bytes:
+                    _, old = self._entries.popitem(last=False)
+                    self._nbytes -= old.nbytes
+                    self.evictions += 1
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,65 @@
+import io
+from typing import Dict, Optional
+
+import pandas as pd
+
+from .date_filters import sort_by_date
+from .excel_reader import SHEET_COLUMNS, read_sheets
+from .tratando_excel import tratando_df
+from .data_store import DataStore
+from .schema import normalize_frames
+from .workbook_cache import content_hash
+
+# Abas lidas de cada planilha de monitoramento
+SHEETS = list(SHEET_COLUMNS)
+DATE_COL = "Data"
+
+
+def parse_workbook(data: bytes, report: Optional[dict] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Parse the workbook bytes into cleaned DataFrames, one per sheet in SHEETS.
+    The workbook is opened once and only the columns used by the views are read.
+    Columns are converted to the compact dtypes of utils.schema.SHEET_SCHEMAS;
+    when report is given it receives, per sheet, the invalid cell counts and the
+    memory before/after. Sheets with a DATE_COL come back sorted by it.
+    """
+    frames = read_sheets(io.BytesIO(data), SHEETS)
+    frames = {sheet: tratando_df(df) for sheet, df in frames.items()}
+    frames, sheet_report = normalize_frames(frames)
+    if report is not None:
+        report.update(sheet_report)
+    # Datas convertidas uma única vez e linhas ordenadas para filtros por busca binária
+    return {
+        sheet: sort_by_date(df, DATE_COL) if DATE_COL in df.columns else df
+        for sheet, df in frames.items()
+    }
+
+
+def load_workbook(
+    data: bytes,
+    store: Optional[DataStore] = None,
+    name: Optional[str] = None,
+    key: Optional[str] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Return the cleaned sheets for the uploaded bytes. In-memory reuse across
+    reruns and sessions is handled by utils.shared_cache.SharedDatasetCache.
+
+    With a store, a workbook ingested in a previous session is reopened from
+    disk instead of being parsed again, and new workbooks are persisted there.
+    key may be given when the content hash of data is already known.
+    """
+    if key is None:
+        key = content_hash(data)
+    if store is not None and store.exists(key):
+        return store.load(key)
+    report = {}
+    frames = parse_workbook(data, report)
+    if store is not None:
+        store.save(key, frames, name=name, report=report)
+    return frames
+
+
+def load_stored(dataset_id: str, store: DataStore) -> Dict[str, pd.DataFrame]:
+    """Return the sheets of a dataset previously saved in the store."""
+    return store.load(dataset_id)
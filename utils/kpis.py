@@ -0,0 +1,77 @@
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Janela (em dias, até o último registro) em que um poço com volume > 0 conta como em operação
+ACTIVE_DAYS = 30
+
+
+def latest_position(dates: np.ndarray) -> int:
+    """
+    Position of the most recent row (the last one among rows sharing the
+    latest date), found with a single argmax; -1 when there is no valid date.
+    """
+    dates = dates.astype("datetime64[ns]")
+    valid = ~np.isnat(dates)
+    if not valid.any():
+        return -1
+    values = np.where(valid, dates.view(np.int64), np.iinfo(np.int64).min)
+    return len(values) - 1 - int(np.argmax(values[::-1]))
+
+
+def days_since(ts, today=None) -> Optional[int]:
+    """Whole days between ts and today (None when ts is missing)."""
+    if ts is None or pd.isna(ts):
+        return None
+    today = pd.to_datetime("today") if today is None else pd.to_datetime(today)
+    return (today - pd.to_datetime(ts)).days
+
+
+def volume_kpis(
+    df: pd.DataFrame,
+    value_cols: Iterable[str],
+    date_col: str = "Data",
+    cumulative=None,
+    start=None,
+    end=None,
+    restart: bool = True,
+    well_col: Optional[str] = None,
+    active_days: int = ACTIVE_DAYS,
+) -> Dict[str, Any]:
+    """
+    Values of the dashboard cards for a (date-filtered) volume frame, computed
+    in one pass over its columns without sorting:
+
+    - last_date: most recent record date
+    - latest: column -> value in the most recent record
+    - cumulative: accumulated volume up to end (from a CumulativeVolume when
+      given, restarting at start unless restart=False; else the window total)
+    - active_wells: wells with volume > 0 in the active_days up to last_date
+      (only when well_col is given)
+    """
+    value_cols = [c for c in value_cols if c in df.columns]
+    dates = df[date_col].to_numpy(dtype="datetime64[ns]")
+    pos = latest_position(dates)
+    result: Dict[str, Any] = {
+        "last_date": pd.Timestamp(dates[pos]) if pos >= 0 else None,
+        "latest": {c: (df[c].iat[pos] if pos >= 0 else np.nan) for c in value_cols},
+    }
+
+    values = np.zeros(len(df))
+    for col in value_cols:
+        values += np.nan_to_num(pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan))
+    if cumulative is not None:
+        result["cumulative"] = cumulative.value(start, end, restart=restart)
+    else:
+        result["cumulative"] = float(values.sum())
+
+    if well_col is not None and well_col in df.columns:
+        if pos >= 0:
+            since = dates[pos] - np.timedelta64(active_days - 1, "D")
+            recent = (dates >= since.astype("datetime64[D]").astype("datetime64[ns]")) & (values > 0)
+            wells = df[well_col].to_numpy()[recent]
+            result["active_wells"] = int(pd.Series(wells).dropna().nunique())
+        else:
+            result["active_wells"] = 0
+    return result
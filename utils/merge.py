@@ -0,0 +1,177 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .date_filters import sort_by_date
+from .workbook_cache import content_hash
+
+# Colunas que identificam uma leitura em cada aba; linhas repetidas entre
+# planilhas são descartadas. Abas sem entrada (sem "Poço", como "Volume Produto"
+# e "Hidrômetros") usam todas as colunas: só linhas idênticas são repetidas.
+SHEET_KEYS: Dict[str, Tuple[str, ...]] = {
+    "Volume Bombeado": ("Data", "Poço"),
+    "FL": ("Data", "Poço"),
+}
+
+
+def _key_column(s: pd.Series) -> pd.Series:
+    # Mesma leitura, mesmo hash: float32/int de uma planilha e float64 de outra,
+    # ou datas em unidades diferentes, não podem gerar hashes distintos
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        return s.astype("datetime64[ns]")
+    if pd.api.types.is_numeric_dtype(s.dtype) and not pd.api.types.is_bool_dtype(s.dtype):
+        return s.astype(np.float64)
+    return s
+
+
+def row_hashes(df: pd.DataFrame, key_cols: Sequence[str]) -> Optional[np.ndarray]:
+    """
+    uint64 hash per row computed over key_cols, or None when any of them is
+    missing from df (the rows cannot be identified, so they are not deduplicated).
+    """
+    if any(c not in df.columns for c in key_cols):
+        return None
+    key = pd.DataFrame({c: _key_column(df[c]) for c in key_cols})
+    return pd.util.hash_pandas_object(key, index=False).to_numpy()
+
+
+def _isin_sorted(values: np.ndarray, sorted_values: np.ndarray) -> np.ndarray:
+    """Boolean mask of values present in the sorted array sorted_values."""
+    if not len(sorted_values):
+        return np.zeros(len(values), dtype=bool)
+    pos = np.searchsorted(sorted_values, values)
+    pos[pos == len(sorted_values)] = 0
+    return sorted_values[pos] == values
+
+
+def _merge_sorted(merged: pd.DataFrame, chunk: pd.DataFrame, date_col: str) -> pd.DataFrame:
+    """
+    Stable merge of two frames already sorted by date_col: rows of chunk go
+    after the rows of merged with the same date. Linear in the total rows,
+    with no re-sort of the merged frame.
+    """
+    pos = np.searchsorted(merged[date_col].to_numpy(), chunk[date_col].to_numpy(), side="right")
+    n = len(merged) + len(chunk)
+    from_chunk = np.zeros(n, dtype=bool)
+    from_chunk[pos + np.arange(len(chunk))] = True
+    order = np.empty(n, dtype=np.int64)
+    order[~from_chunk] = np.arange(len(merged))
+    order[from_chunk] = np.arange(len(merged), n)
+    out = pd.concat([merged, chunk], ignore_index=True)
+    # Categorias diferentes entre planilhas viram object no concat
+    for col in merged.columns:
+        if isinstance(merged[col].dtype, pd.CategoricalDtype) and not isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype("category")
+    return out.take(order).reset_index(drop=True)
+
+
+class WorkbookMerger:
+    """
+    Incrementally combine several workbooks, sheet by sheet.
+
+    Every added workbook is deduplicated against a per-sheet index of row
+    hashes over the sheet's key (sheet_keys, or every column for sheets not
+    listed there), so only rows not seen in earlier workbooks are kept. Sheets
+    missing a key column are not deduplicated. The index is a single sorted
+    hash array per sheet: a new workbook is checked with one binary search
+    per row and its new hashes are inserted in place, with no re-sort.
+
+    The merged frame of a sheet is kept sorted by date_col. Chunks added since
+    it was last requested are sorted on their own and merged into it, instead
+    of concatenating and re-sorting everything.
+    """
+
+    def __init__(self, sheet_keys: Optional[Dict[str, Sequence[str]]] = None, date_col: str = "Data"):
+        self.sheet_keys = {sheet: tuple(cols) for sheet, cols in (SHEET_KEYS if sheet_keys is None else sheet_keys).items()}
+        self.date_col = date_col
+        self.sources: List[str] = []
+        self.duplicates = 0
+        self._pending: Dict[str, List[pd.DataFrame]] = {}
+        self._seen: Dict[str, np.ndarray] = {}
+        self._merged: Dict[str, pd.DataFrame] = {}
+        self._derived: Dict[str, Any] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.sources
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    @property
+    def version(self) -> str:
+        """Identifier of the merged content (hash of the ordered source keys)."""
+        return content_hash("|".join(self.sources).encode())
+
+    def key_cols(self, sheet: str, df: pd.DataFrame) -> Tuple[str, ...]:
+        """Columns identifying a row of sheet."""
+        return self.sheet_keys.get(sheet, tuple(df.columns))
+
+    def add(self, key: str, frames: Dict[str, pd.DataFrame]) -> bool:
+        """
+        Merge the sheets of one workbook identified by key (its content hash).
+        Returns False if the workbook had already been added.
+        """
+        if key in self.sources:
+            return False
+        for sheet, df in frames.items():
+            hashes = row_hashes(df, self.key_cols(sheet, df))
+            if hashes is not None and len(hashes):
+                seen = self._seen.get(sheet, np.empty(0, dtype=np.uint64))
+                dup = _isin_sorted(hashes, seen)
+                new = np.unique(hashes[~dup])
+                self._seen[sheet] = np.insert(seen, np.searchsorted(seen, new), new)
+                if dup.any():
+                    self.duplicates += int(dup.sum())
+                    df = df[~dup]
+            self._pending.setdefault(sheet, []).append(df)
+        self._derived.clear()
+        self.sources.append(key)
+        return True
+
+    def frame(self, sheet: str) -> Optional[pd.DataFrame]:
+        """Merged frame of one sheet (None if no workbook had that sheet)."""
+        merged = self._merged.get(sheet)
+        for chunk in self._pending.pop(sheet, []):
+            if self.date_col in chunk.columns:
+                chunk = sort_by_date(chunk, self.date_col)
+            if merged is None:
+                merged = chunk.reset_index(drop=True)
+            elif self.date_col in chunk.columns and self.date_col in merged.columns:
+                merged = _merge_sorted(merged, chunk, self.date_col)
+            else:
+                merged = pd.concat([merged, chunk], ignore_index=True)
+            self._merged[sheet] = merged
+        return merged
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        return {sheet: self.frame(sheet) for sheet in dict.fromkeys([*self._merged, *self._pending])}
+
+    def cached(self, name: str, build: Callable[[], Any]) -> Any:
+        """
+        Structure derived from the merged frames (indexes, rollups...), built
+        on first use and kept until another workbook is added.
+        """
+        if name not in self._derived:
+            self._derived[name] = build()
+        return self._derived[name]
+
+
+def merge_sources(
+    merger: Optional[WorkbookMerger],
+    sources: Iterable[Tuple[str, Callable[[], Dict[str, pd.DataFrame]]]],
+) -> WorkbookMerger:
+    """
+    Bring merger up to date with the ordered (key, loader) sources.
+
+    Only sources not merged yet are loaded. If a previously merged source is
+    no longer present (file removed from the uploader), the merge restarts.
+    """
+    sources = list(dict(sources).items())
+    keys = [key for key, _ in sources]
+    if merger is None or keys[: len(merger.sources)] != merger.sources:
+        merger = WorkbookMerger()
+    for key, loader in sources:
+        if key not in merger:
+            merger.add(key, loader())
+    return merger
@@ -0,0 +1,221 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+# Profiler da execução atual do script (None = instrumentação desligada)
+_active: ContextVar[Optional["StageProfiler"]] = ContextVar("stage_profiler", default=None)
+
+PERCENTILES = (50, 90, 99)
+
+
+def _rss() -> Optional[int]:
+    """Memória residente do processo em bytes (Linux); None onde não há /proc."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def count_rows(obj) -> Optional[int]:
+    """Linhas de um DataFrame (ou soma das linhas de um dict de DataFrames)."""
+    if isinstance(obj, dict):
+        counts = [count_rows(v) for v in obj.values()]
+        return sum(c for c in counts if c is not None) if counts else None
+    if hasattr(obj, "shape") and hasattr(obj, "columns"):
+        return int(obj.shape[0])
+    return None
+
+
+class _NullStage:
+    """Etapa usada quando a instrumentação está desligada: não mede nada."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "rows_in", "rows_out", "_t0", "_rss0")
+
+    def __init__(self, profiler: "StageProfiler", name: str, rows_in: Optional[int]):
+        self.profiler = profiler
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+
+    def __enter__(self):
+        self._rss0 = _rss()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._t0
+        rss = _rss()
+        self.profiler.record(
+            self.name,
+            seconds,
+            rows_in=self.rows_in,
+            rows_out=self.rows_out,
+            mem_delta=None if rss is None or self._rss0 is None else rss - self._rss0,
+            error=None if exc_type is None else exc_type.__name__,
+        )
+        return False
+
+
+class StageProfiler:
+    """
+    Tempos das etapas do dashboard (leitura, tratamento, filtros, figuras,
+    downloads) a cada execução do script.
+
+    Cada registro guarda a execução (run), o nome da etapa, o tempo de parede,
+    as linhas de entrada/saída e a variação da memória residente. Os registros
+    ficam em um deque limitado a max_records.
+
+    Desligado (enabled=False), stage() devolve um contexto vazio compartilhado,
+    então o custo nas etapas instrumentadas é uma consulta a um ContextVar.
+    """
+
+    def __init__(self, enabled: bool = False, max_records: int = 5000):
+        self.enabled = enabled
+        self.run = 0
+        self._records: deque = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def begin_run(self) -> int:
+        """Marca o início de uma nova execução do script."""
+        with self._lock:
+            self.run += 1
+            return self.run
+
+    def stage(self, name: str, rows_in: Optional[int] = None):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, rows_in)
+
+    def record(self, name: str, seconds: float, rows_in=None, rows_out=None, mem_delta=None, error=None) -> None:
+        with self._lock:
+            self._records.append({
+                "run": self.run,
+                "time": time.time(),
+                "stage": name,
+                "seconds": seconds,
+                "rows_in": rows_in,
+                "rows_out": rows_out,
+                "mem_delta": mem_delta,
+                "error": error,
+            })
+
+    def records(self, run: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            records = list(self._records)
+        return records if run is None else [r for r in records if r["run"] == run]
+
+    def last_complete_run(self) -> Optional[int]:
+        """Última execução já terminada (a atual ainda está sendo medida)."""
+        runs = [r["run"] for r in self.records() if r["run"] < self.run]
+        return max(runs) if runs else None
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Por etapa: execuções medidas, último tempo e percentis (segundos)."""
+        by_stage: Dict[str, List[float]] = {}
+        last: Dict[str, float] = {}
+        for r in self.records():
+            by_stage.setdefault(r["stage"], []).append(r["seconds"])
+            last[r["stage"]] = r["seconds"]
+        rows = []
+        for name, seconds in by_stage.items():
+            values = np.percentile(seconds, PERCENTILES)
+            row = {"stage": name, "n": len(seconds), "last": last[name]}
+            row.update({f"p{p}": float(v) for p, v in zip(PERCENTILES, values)})
+            rows.append(row)
+        return sorted(rows, key=lambda r: r[f"p{PERCENTILES[-1]}"], reverse=True)
+
+    def to_jsonl(self) -> bytes:
+        """Todos os registros em JSON lines, para análise fora do app."""
+        return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self.records()).encode("utf-8")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+def activate(profiler: Optional[StageProfiler]):
+    """Define o profiler da execução atual; devolve o token do ContextVar."""
+    return _active.set(profiler)
+
+
+def current() -> Optional[StageProfiler]:
+    profiler = _active.get()
+    return profiler if profiler is not None and profiler.enabled else None
+
+
+def stage(name: str, rows_in: Optional[int] = None):
+    """
+    Contexto que mede uma etapa no profiler ativo. Defina `.rows_out` dentro
+    do bloco para registrar as linhas produzidas.
+    """
+    profiler = _active.get()
+    if profiler is None or not profiler.enabled:
+        return _NULL_STAGE
+    return _Stage(profiler, name, rows_in)
+
+
+def timed(name: Optional[str] = None):
+    """
+    Decorador que mede a função como uma etapa. As linhas de entrada vêm do
+    primeiro argumento e as de saída do retorno (DataFrame ou dict deles).
+    """
+    def decorator(fn: Callable) -> Callable:
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profiler = _active.get()
+            if profiler is None or not profiler.enabled:
+                return fn(*args, **kwargs)
+            with _Stage(profiler, label, count_rows(args[0]) if args else None) as s:
+                result = fn(*args, **kwargs)
+                s.rows_out = count_rows(result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def bound(fn: Callable) -> Callable:
+    """
+    Liga fn ao profiler ativo agora, para funções chamadas depois em outra
+    thread (ex.: geração de downloads no clique). Sem profiler ativo, devolve fn.
+    """
+    profiler = current()
+    if profiler is None:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _active.set(profiler)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _active.reset(token)
+
+    return wrapper
@@ -0,0 +1,188 @@
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .date_filters import PADDED_AGGREGATIONS, full_period_index, sort_by_date
+
+AGGREGATIONS = ("sum", "mean", "last", "count")
+
+
+class DailyRollup:
+    """
+    Materialized (group, day) rollup of a frame, built once per dataset.
+
+    Only the observed (group, day) cells are stored, in a CSR-like layout:
+    cells are sorted by group and day, `_indptr[g]:_indptr[g + 1]` is the
+    slice of group g and `_days` holds the day offset (int32) of each cell.
+    For every value column, aligned with the cells:
+
+    - prefix sums of the daily sums (float64) and of the daily counts of
+      valid values (int32), so the sum/count/mean of any span of cells of one
+      group is a difference of two entries;
+    - the last valid value of each day and, per cell, the position of the
+      most recent cell with a value (int32), so "last value in a period" is a
+      lookup.
+
+    query() derives any granularity (D/W-MON/MS/YS) and any date window from
+    these arrays with a binary search per (group, period) bound, independent
+    of the raw row count. Memory grows with the observed cells, not with
+    groups x days.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        value_cols: Iterable[str],
+        date_col: str = "Data",
+        group_col: Optional[str] = None,
+    ):
+        self.date_col = date_col
+        self.group_col = group_col
+        self.value_cols: List[str] = [c for c in value_cols if c in df.columns]
+
+        df = sort_by_date(df, date_col)
+        if group_col is not None:
+            df = df.loc[df[group_col].notna()]
+            self.groups: List = list(pd.unique(df[group_col]))
+            codes = pd.Categorical(df[group_col], categories=self.groups).codes.astype(np.int64)
+        else:
+            self.groups = [None]
+            codes = np.zeros(len(df), dtype=np.int64)
+
+        days = df[date_col].dt.normalize()
+        if len(df):
+            self.first_day = days.iloc[0]
+            n_days = int((days.iloc[-1] - self.first_day).days) + 1
+        else:
+            self.first_day = pd.Timestamp("1970-01-01")
+            n_days = 0
+        self.n_days = n_days
+        day_idx = (days - self.first_day).dt.days.to_numpy(dtype=np.int64)
+
+        # Células observadas, ordenadas por (grupo, dia); `cell` liga cada linha à sua célula
+        keys, cell = np.unique(codes * (n_days + 1) + day_idx, return_inverse=True)
+        cell_group = keys // (n_days + 1)
+        self._days = (keys % (n_days + 1)).astype(np.int32)
+        self._indptr = np.searchsorted(cell_group, np.arange(len(self.groups) + 1)).astype(np.int64)
+        n_cells = len(keys)
+
+        self._csum: Dict[str, np.ndarray] = {}
+        self._ccount: Dict[str, np.ndarray] = {}
+        self._day_last: Dict[str, np.ndarray] = {}
+        self._last_cell: Dict[str, np.ndarray] = {}
+        positions = np.arange(n_cells, dtype=np.int32)
+        for col in self.value_cols:
+            values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnan(values)
+            sums = np.bincount(cell, weights=np.where(valid, values, 0.0), minlength=n_cells)
+            counts = np.bincount(cell[valid], minlength=n_cells).astype(np.int32)
+            self._csum[col] = self._prefix(sums, np.float64)
+            self._ccount[col] = self._prefix(counts, np.int32)
+
+            # Último valor válido de cada dia (linhas já ordenadas por data)
+            day_last = np.full(n_cells, np.nan)
+            valid_cells = cell[valid][::-1]
+            uniq, first_in_reversed = np.unique(valid_cells, return_index=True)
+            day_last[uniq] = values[valid][::-1][first_in_reversed]
+            self._day_last[col] = day_last
+            # Posição da última célula com valor até cada célula (-1: nenhuma);
+            # query() descarta as que caem antes do início do período (ou em outro grupo)
+            self._last_cell[col] = np.maximum.accumulate(np.where(counts > 0, positions, -1)) if n_cells else positions
+
+    @staticmethod
+    def _prefix(a: np.ndarray, dtype) -> np.ndarray:
+        out = np.zeros(len(a) + 1, dtype=dtype)
+        np.cumsum(a, out=out[1:])
+        return out
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self._days, self._indptr, *self._csum.values(), *self._ccount.values(),
+                  *self._day_last.values(), *self._last_cell.values()]
+        return int(sum(a.nbytes for a in arrays))
+
+    def _day(self, ts) -> int:
+        return int((pd.Timestamp(ts).normalize() - self.first_day).days)
+
+    def _cell_bounds(self, rows: np.ndarray, b: np.ndarray, e: np.ndarray):
+        """Posições [pb, pe) das células de cada grupo em rows nos dias [b, e) de cada período."""
+        pb = np.empty((len(rows), len(b)), dtype=np.int64)
+        pe = np.empty_like(pb)
+        for i, g in enumerate(rows):
+            lo, hi = self._indptr[g], self._indptr[g + 1]
+            days = self._days[lo:hi]
+            pb[i] = lo + np.searchsorted(days, b, side="left")
+            pe[i] = lo + np.searchsorted(days, e, side="left")
+        return pb, pe
+
+    def query(
+        self,
+        start,
+        end,
+        freq: str,
+        how: Dict[str, str],
+        groups: Optional[Iterable] = None,
+    ) -> pd.DataFrame:
+        """
+        Aggregated frame with one row per (group, period) of [start, end].
+
+        - how: column -> 'sum' | 'mean' | 'last' | 'count'
+        - groups: restrict to these groups (default: all, in first-seen order)
+
+        Periods without data get 0 for sum/count. When every aggregation is
+        mean/last, (group, period) rows without any valid value are left out,
+        like aggregate_full_period; otherwise mean/last are NaN there.
+        """
+        periods = full_period_index(start, end, freq)
+        n_periods = len(periods)
+        # Limites [b, e) de cada período em dias do cubo, recortados à janela
+        lo = self._day(start)
+        hi = self._day(end) + 1
+        starts = np.asarray((periods - self.first_day).days, dtype=np.int64)
+        b = np.clip(np.maximum(starts, lo), 0, self.n_days)
+        e = np.clip(np.minimum(np.append(starts[1:], hi), hi), 0, self.n_days)
+        e = np.maximum(e, b)
+
+        if groups is None:
+            rows = np.arange(len(self.groups))
+            group_labels = self.groups
+        else:
+            lookup = {g: i for i, g in enumerate(self.groups)}
+            group_labels = [g for g in groups if g in lookup]
+            rows = np.array([lookup[g] for g in group_labels], dtype=np.int64)
+
+        out = {}
+        if self.group_col is not None:
+            out[self.group_col] = np.repeat(np.array(group_labels, dtype=object), n_periods)
+        out[self.date_col] = np.tile(periods.to_numpy(), len(rows))
+
+        pb, pe = self._cell_bounds(rows, b, e)
+        padded = any(agg in PADDED_AGGREGATIONS for agg in how.values())
+        observed = np.zeros(len(rows) * n_periods, dtype=bool)
+        for col, agg in how.items():
+            if agg not in AGGREGATIONS:
+                raise ValueError(f"Unsupported aggregation {agg!r} for {col!r}")
+            if col not in self._csum or len(rows) == 0 or self.n_days == 0:
+                fill = 0.0 if agg in PADDED_AGGREGATIONS else np.nan
+                out[col] = np.full(len(rows) * n_periods, fill)
+                continue
+            sums = self._csum[col][pe] - self._csum[col][pb]
+            counts = self._ccount[col][pe] - self._ccount[col][pb]
+            observed |= (counts > 0).reshape(-1)
+            if agg == "sum":
+                values = sums
+            elif agg == "count":
+                values = counts.astype(np.float64)
+            elif agg == "mean":
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    values = np.where(counts > 0, sums / counts, np.nan)
+            else:
+                last = self._last_cell[col][np.maximum(pe - 1, 0)]
+                ok = (pe > pb) & (last >= pb)
+                values = np.where(ok, self._day_last[col][np.maximum(last, 0)], np.nan)
+            out[col] = values.reshape(-1)
+        result = pd.DataFrame(out)
+        if not padded:
+            result = result.loc[observed].reset_index(drop=True)
+        return result
@@ -0,0 +1,116 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Tipo de cada coluna depois da ingestão:
+# - "datetime": convertida uma única vez (texto em dd/mm/aaaa)
+# - "category": texto repetido (poços) guardado como códigos
+# - "float": numérico; vira float32 só quando todos os valores são exatos em
+#   float32 (leituras como 2.386 continuam em float64)
+# Colunas numéricas não listadas seguem a mesma regra.
+SHEET_SCHEMAS: Dict[str, Dict[str, str]] = {
+    "Volume Bombeado": {"Data": "datetime", "Poço": "category", "Volume Bombeado (L)": "float"},
+    "Volume Produto": {
+        "Data": "datetime",
+        "Volume Removido SAO (L)": "float",
+        "Volume Removido Bailer (L)": "float",
+    },
+    "FL": {"Data": "datetime", "Poço": "category", "NA (m)": "float", "NO (m)": "float", "Esp. (m)": "float"},
+    "Hidrômetros": {"Data": "datetime"},
+}
+
+
+def _blank(s: pd.Series) -> np.ndarray:
+    """Células vazias (NaN/None ou texto só com espaços): ausentes, não inválidas."""
+    blank = s.isna().to_numpy()
+    if s.dtype == object or pd.api.types.is_string_dtype(s):
+        text = s.astype("string").str.strip()
+        blank = blank | (text == "").fillna(True).to_numpy(dtype=bool)
+    return blank
+
+
+def _downcast_float(s: pd.Series) -> pd.Series:
+    """float32 se todos os valores voltam idênticos para float64; senão s sem mudança."""
+    s32 = s.astype(np.float32)
+    if np.array_equal(s32.to_numpy(dtype=np.float64), s.to_numpy(dtype=np.float64), equal_nan=True):
+        return s32
+    return s
+
+
+def _to_float(s: pd.Series) -> pd.Series:
+    if not pd.api.types.is_numeric_dtype(s):
+        # Planilhas preenchidas à mão: "2,5" usa vírgula decimal
+        s = s.astype("string").str.strip().str.replace(",", ".", regex=False)
+    # Texto convertido vem como Float64 (anulável); volta para float numpy
+    return _downcast_float(pd.to_numeric(s, errors="coerce").astype("float64"))
+
+
+def _to_datetime(s: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    return pd.to_datetime(s, errors="coerce", dayfirst=True)
+
+
+def _to_category(s: pd.Series) -> pd.Series:
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s
+    return s.astype("string").str.strip().replace("", pd.NA).astype("category")
+
+
+CONVERTERS = {"datetime": _to_datetime, "float": _to_float, "category": _to_category}
+
+
+def normalize_frame(df: pd.DataFrame, schema: Optional[Dict[str, str]] = None) -> Tuple[pd.DataFrame, dict]:
+    """
+    Convert the columns of df to the compact dtypes declared in schema.
+
+    Cells that are filled but cannot be converted become missing values and
+    are counted per column in the report, together with the frame memory
+    (deep) before and after the conversion. The input frame is not modified.
+    """
+    schema = schema or {}
+    before = int(df.memory_usage(deep=True).sum())
+    out = {}
+    invalid: Dict[str, int] = {}
+    for col in df.columns:
+        s = df[col]
+        kind = schema.get(col)
+        if kind is None:
+            # Numéricos não declarados: só reduz a precisão quando não há perda
+            if pd.api.types.is_float_dtype(s):
+                s = _downcast_float(s.astype("float64"))
+            elif pd.api.types.is_integer_dtype(s):
+                s = pd.to_numeric(s, downcast="integer")
+            out[col] = s
+            continue
+        converted = CONVERTERS[kind](s)
+        bad = int((converted.isna().to_numpy() & ~_blank(s)).sum())
+        if bad:
+            invalid[col] = bad
+        out[col] = converted
+    result = pd.DataFrame(out, index=df.index)
+    report = {
+        "rows": len(result),
+        "invalid": invalid,
+        "bytes_before": before,
+        "bytes_after": int(result.memory_usage(deep=True).sum()),
+    }
+    return result, report
+
+
+def normalize_frames(
+    frames: Dict[str, pd.DataFrame], schemas: Optional[Dict[str, Dict[str, str]]] = None
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, dict]]:
+    """normalize_frame applied to every sheet; returns (frames, report per sheet)."""
+    if schemas is None:
+        schemas = SHEET_SCHEMAS
+    normalized, report = {}, {}
+    for sheet, df in frames.items():
+        normalized[sheet], report[sheet] = normalize_frame(df, schemas.get(sheet))
+    return normalized, report
+
+
+def memory_report(frames: Dict[str, pd.DataFrame]) -> Dict[str, int]:
+    """Memória (deep, em bytes) de cada DataFrame."""
+    return {sheet: int(df.memory_usage(deep=True).sum()) for sheet, df in frames.items() if df is not None}
@@ -0,0 +1,225 @@
+import os
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+import pandas as pd
+
+from .workbook_cache import frames_nbytes
+
+Frames = Dict[str, pd.DataFrame]
+
+
+def readonly_view(frames: Frames) -> Frames:
+    """
+    New mapping of shallow copies of frames. With Copy-on-Write (always on from
+    pandas 3, the minimum in requirements.txt), any change made through a copy
+    (assigning columns, inplace drop/fillna, .loc writes) copies the affected
+    data first, so the original frames are never modified.
+    """
+    return {sheet: df.copy(deep=False) for sheet, df in frames.items()}
+
+
+class SharedDatasetCache:
+    """
+    Process-wide cache of parsed workbooks shared by every Streamlit session,
+    keyed by the content hash of the file.
+
+    - Read-only: callers always get readonly_view copies of the stored frames,
+      so one session's filters and column assignments never reach another's.
+    - Reference counted: a session acquire()s the keys it is showing and
+      release()s them when it stops (release_owner() drops all of them).
+    - Byte budget: when the cached frames exceed max_bytes, entries no session
+      holds are evicted in least-recently-used order. Entries in use are kept
+      even above the budget, since dropping them would free no memory.
+    - Single load: concurrent get_or_load() calls for the same key run the
+      loader once; the other sessions wait for its result.
+    - Derived structures: derived() keeps indexes and rollups built from a
+      merged dataset version, so sessions showing the same workbooks share
+      one copy. They count towards the budget and are evicted like unused
+      workbooks.
+    """
+
+    def __init__(self, max_bytes: int = 1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        # Chave str: abas de uma planilha; tupla ("derived", versão, nome): estrutura derivada
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self._sizes: Dict[Any, int] = {}
+        self._owners: Dict[str, Set[str]] = {}
+        self._loading: Dict[Any, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def get(self, key: str) -> Optional[Frames]:
+        """Read-only view of the cached frames for key (marked as recently used) or None."""
+        with self._lock:
+            frames = self._entries.get(key)
+            if frames is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return readonly_view(frames)
+
+    def put(self, key: str, frames: Frames) -> None:
+        """Store (shallow copies of) frames under key and evict unused entries over the budget."""
+        frames = readonly_view(frames)
+        self._put(key, frames, frames_nbytes(frames))
+
+    def _put(self, key: Any, value: Any, size: int) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = int(size)
+            self._evict()
+
+    def get_or_load(self, key: str, loader: Callable[[], Frames]) -> Frames:
+        """Cached frames for key, calling loader() only once per key across sessions."""
+        frames = self.get(key)
+        if frames is not None:
+            return frames
+        return readonly_view(self._load(key, lambda: readonly_view(loader()), frames_nbytes))
+
+    def derived(self, version: str, name: str, build: Callable[[], Any]) -> Any:
+        """
+        Structure derived from the merged dataset identified by version (indexes,
+        rollups...), built once and shared by every session showing that version.
+        Callers must treat the result as read-only.
+        """
+        key = ("derived", version, name)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        return self._load(key, build, lambda obj: getattr(obj, "nbytes", 0))
+
+    def _load(self, key: Any, loader: Callable[[], Any], size: Callable[[Any], int]) -> Any:
+        """Run loader() once per key (other callers wait) and keep its result."""
+        with self._lock:
+            loading = self._loading.setdefault(key, threading.Lock())
+        try:
+            with loading:
+                with self._lock:
+                    value = self._entries.get(key)
+                    if value is not None:
+                        self._entries.move_to_end(key)
+                        return value
+                value = loader()
+                self._put(key, value, size(value))
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+        return value
+
+    def acquire(self, key: str, owner: str) -> None:
+        """Mark key as in use by owner (may be called before the key is loaded)."""
+        with self._lock:
+            self._owners.setdefault(key, set()).add(owner)
+
+    def release(self, key: str, owner: str) -> None:
+        with self._lock:
+            owners = self._owners.get(key)
+            if owners is not None:
+                owners.discard(owner)
+                if not owners:
+                    del self._owners[key]
+            self._evict()
+
+    def release_owner(self, owner: str) -> None:
+        """Release every key held by owner (session closed)."""
+        with self._lock:
+            for key in [k for k, owners in self._owners.items() if owner in owners]:
+                self._owners[key].discard(owner)
+                if not self._owners[key]:
+                    del self._owners[key]
+            self._evict()
+
+    def refcount(self, key: str) -> int:
+        with self._lock:
+            return len(self._owners.get(key, ()))
+
+    def clear(self) -> None:
+        """Drop every entry not in use."""
+        with self._lock:
+            for key in [k for k in self._entries if k not in self._owners]:
+                self._drop(key)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for display/debugging."""
+        with self._lock:
+            return {
+                "entries": sum(1 for k in self._entries if not isinstance(k, tuple)),
+                "derived": sum(1 for k in self._entries if isinstance(k, tuple)),
+                "in_use": sum(1 for k in self._entries if k in self._owners),
+                "sessions": len(set().union(*self._owners.values())) if self._owners else 0,
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _drop(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._sizes.pop(key, None)
+
+    def _evict(self) -> None:
+        # Chamado com self._lock já adquirido
+        if self.nbytes <= self.max_bytes:
+            return
+        for key in [k for k in self._entries if k not in self._owners]:
+            self._drop(key)
+            self.evictions += 1
+            if self.nbytes <= self.max_bytes:
+                return
+
+
+class DatasetLease:
+    """
+    Keys of the shared cache held by one session. hold() acquires the keys the
+    session now shows and releases the ones it no longer does; everything is
+    released when the lease is garbage collected (session state discarded).
+    """
+
+    def __init__(self, cache: SharedDatasetCache):
+        self.cache = cache
+        self.owner = uuid.uuid4().hex
+        self.keys: Set[str] = set()
+        weakref.finalize(self, cache.release_owner, self.owner)
+
+    def hold(self, keys: Iterable[str]) -> None:
+        keys = set(keys)
+        for key in keys - self.keys:
+            self.cache.acquire(key, self.owner)
+        for key in self.keys - keys:
+            self.cache.release(key, self.owner)
+        self.keys = keys
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> SharedDatasetCache:
+    """Cache compartilhado pelo processo (orçamento em MB por SHARED_CACHE_MB)."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SharedDatasetCache(max_bytes=int(float(os.environ.get("SHARED_CACHE_MB", 1024)) * 2**20))
+        return _shared_cache
@@ -1,25 +1,35 @@
-import pandas as pd
+import numpy as np
 
+from .date_filters import clamp_date_range
+from .profiling import timed
+
+@timed("tratando_df")
 def tratando_df(df):
-    """Função para tratar DataFrame."""
-    df.drop(columns=[col for col in df.columns if "Unnamed" in col], inplace=True)
-    df = df[df['Data'].notna()]
-    df.reset_index(drop=True, inplace=True)
-    return df
+    """Função para tratar DataFrame (devolve um novo DataFrame; o original não é alterado)."""
+    df = df.drop(columns=[col for col in df.columns if "Unnamed" in col])
+    return df[df['Data'].notna()].reset_index(drop=True)
 
 def fillna_columns(df, columns, value=0):
-    """Preenche NaN nas colunas especificadas com o valor dado."""
-    for col in columns:
-        if col in df.columns:
-            df[col] = df[col].fillna(value)
-    return df
+    """Preenche NaN nas colunas especificadas com o valor dado (em um novo DataFrame)."""
+    return df.assign(**{col: df[col].fillna(value) for col in columns if col in df.columns})
 
-def add_accumulated_column(df, cols_to_sum, new_col):
-    """Adiciona uma coluna acumulada baseada na soma das colunas fornecidas."""
-    df[new_col] = df[cols_to_sum].sum(axis=1).cumsum()
-    return df
+def add_accumulated_column(df, cols_to_sum, new_col, date_col='Data'):
+    """
+    Adiciona uma coluna acumulada baseada na soma das colunas fornecidas, em
+    ordem de data (independe da ordem das linhas), em um novo DataFrame. Para
+    janelas de data sobre os mesmos dados, prefira CumulativeVolume, que
+    acumula uma única vez.
+    """
+    soma = df[cols_to_sum].sum(axis=1).to_numpy(dtype=float)
+    if date_col in df.columns and not df[date_col].is_monotonic_increasing:
+        ordem = np.argsort(df[date_col].to_numpy(), kind='stable')
+        acumulado = np.empty_like(soma)
+        acumulado[ordem] = soma[ordem].cumsum()
+    else:
+        acumulado = soma.cumsum()
+    return df.assign(**{new_col: acumulado})
 
+@timed("filter_by_date")
 def filter_by_date(df, date_col, start, end):
-    """Filtra o DataFrame pelo intervalo de datas."""
-    mask = (pd.to_datetime(df[date_col]) >= pd.to_datetime(start)) & (pd.to_datetime(df[date_col]) <= pd.to_datetime(end))
-    return df[mask]
\ No newline at end of file
+    """Filtra o DataFrame pelo intervalo de datas (busca binária se já ordenado por data)."""
+    return clamp_date_range(df, date_col, start, end)
\ No newline at end of file
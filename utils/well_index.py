@@ -0,0 +1,58 @@
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .date_filters import date_bounds, sort_by_date
+
+
+class WellIndex:
+    """
+    Partition index of a frame by well.
+
+    Rows are reordered once so that each well occupies a contiguous block,
+    still sorted by date inside the block. Selecting wells then concatenates a
+    few precomputed slices, and a date range is located inside each block by
+    binary search. Rows without a well are left out of the index.
+    """
+
+    def __init__(self, df: pd.DataFrame, well_col: str = "Poço", date_col: str = "Data"):
+        self.well_col = well_col
+        self.date_col = date_col
+        df = sort_by_date(df, date_col)
+        # Poços na ordem em que aparecem (mesma ordem de df[well_col].unique())
+        self.wells: List = [w for w in pd.unique(df[well_col]) if not pd.isna(w)]
+        codes = pd.Categorical(df[well_col], categories=self.wells).codes
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        self.frame = df.iloc[order].reset_index(drop=True)
+        starts = np.searchsorted(codes, np.arange(len(self.wells)), side="left")
+        stops = np.searchsorted(codes, np.arange(len(self.wells)), side="right")
+        self.blocks: Dict[object, Tuple[int, int]] = {
+            well: (int(a), int(b)) for well, a, b in zip(self.wells, starts, stops)
+        }
+
+    def __len__(self) -> int:
+        return len(self.wells)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.frame.memory_usage(deep=True).sum())
+
+    def partition(self, well, start=None, end=None) -> pd.DataFrame:
+        """Rows of one well, optionally limited to the inclusive [start, end] range."""
+        a, b = self.blocks.get(well, (0, 0))
+        block = self.frame.iloc[a:b]
+        if start is None and end is None:
+            return block
+        i, j = date_bounds(block, self.date_col, start, end)
+        return block.iloc[i:j]
+
+    def select(self, wells: Iterable, start=None, end=None) -> pd.DataFrame:
+        """Rows of the given wells in [start, end], grouped by well in the order given."""
+        parts = [self.partition(w, start, end) for w in wells if w in self.blocks]
+        if not parts:
+            return self.frame.iloc[0:0]
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts)
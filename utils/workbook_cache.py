@@ -0,0 +1,15 @@
+import hashlib
+from typing import Dict
+
+import pandas as pd
+
+
+def content_hash(data: bytes) -> str:
+    """Return a stable hex digest identifying the uploaded file contents."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def frames_nbytes(frames: Dict[str, pd.DataFrame]) -> int:
+    """Deep memory footprint (bytes) of a mapping of DataFrames."""
+    return int(sum(df.memory_usage(deep=True).sum() for df in frames.values()))
+